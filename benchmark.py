@@ -0,0 +1,606 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for speech-to-text-to-speech
+
+Runs offline on a plain machine, without a microphone, speakers or a
+Speakerbot instance:
+
+    python benchmark.py mock-speakerbot       # stand-in Speakerbot server
+    python benchmark.py speakerbot --rate 20  # websocket load benchmark
+    python benchmark.py stt --models tiny base --engines whisper faster-whisper
+    python benchmark.py tts --backends piper styletts2 neutts
+"""
+
+import argparse
+import asyncio
+import glob
+import json
+import logging
+import multiprocessing
+import os
+import random
+import re
+import sys
+import time
+
+import numpy as np
+
+import main
+from main import (
+    AudioRecorder, NeuTTSClient, PiperClient, RealTimeFactor, SpeakerbotClient, StyleTTS2Client,
+    WhisperTranscriber, load_wav, websockets
+)
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+class MockSpeakerbotServer:
+    """Local stand-in for Speakerbot's websocket ``Speak`` endpoint
+
+    Each request is acknowledged with ``{"id": ..., "status": "ok"}`` after
+    ``ack_delay`` plus up to ``jitter`` seconds. Every ``disconnect_every``
+    seconds all open connections are dropped to exercise reconnects.
+    """
+
+    def __init__(self, host="127.0.0.1", port=7585, ack_delay=0.02, jitter=0.01, disconnect_every=0.0):
+        self.host = host
+        self.port = port
+        self.ack_delay = ack_delay
+        self.jitter = jitter
+        self.disconnect_every = disconnect_every
+        self.received = 0
+        self.disconnects = []
+        self._server = None
+        self._connections = set()
+        self._disconnect_task = None
+
+    @property
+    def url(self):
+        return f"ws://{self.host}:{self.port}/speak"
+
+    async def start(self):
+        self._server = await websockets.serve(self._handle, self.host, self.port)
+        if self.disconnect_every > 0:
+            self._disconnect_task = asyncio.create_task(self._disconnect_periodically())
+
+    async def stop(self):
+        if self._disconnect_task:
+            self._disconnect_task.cancel()
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _handle(self, websocket, *args):
+        self._connections.add(websocket)
+        try:
+            async for message in websocket:
+                try:
+                    request = json.loads(message)
+                except ValueError:
+                    await websocket.send(json.dumps({"status": "error", "error": "invalid json"}))
+                    continue
+                self.received += 1
+                asyncio.create_task(self._acknowledge(websocket, request))
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            self._connections.discard(websocket)
+
+    async def _acknowledge(self, websocket, request):
+        await asyncio.sleep(self.ack_delay + random.uniform(0, self.jitter))
+        status = "ok" if request.get("request") == "Speak" else "error"
+        try:
+            await websocket.send(json.dumps({"id": request.get("id"), "status": status}))
+        except websockets.ConnectionClosed:
+            pass
+
+    async def _disconnect_periodically(self):
+        while True:
+            await asyncio.sleep(self.disconnect_every)
+            if self._connections:
+                self.disconnects.append(time.monotonic())
+                for websocket in list(self._connections):
+                    await websocket.close(code=1012, reason="mock restart")
+
+
+async def run_mock_server(args):
+    """Serve the mock Speakerbot until interrupted"""
+    server = MockSpeakerbotServer(args.host, args.port, args.ack_delay, args.jitter, args.disconnect_every)
+    await server.start()
+    print(f"Mock Speakerbot listening on {server.url}")
+    try:
+        await asyncio.Future()
+    finally:
+        await server.stop()
+
+
+async def speakerbot_load(args):
+    """Drive SpeakerbotClient at a fixed message rate and measure the results"""
+    server = None
+    url = args.url
+    if not url:
+        server = MockSpeakerbotServer(
+            port=args.port, ack_delay=args.ack_delay, jitter=args.jitter, disconnect_every=args.disconnect_every
+        )
+        await server.start()
+        url = server.url
+
+    client = SpeakerbotClient(url, send_queue_size=args.queue_size, max_in_flight=args.max_in_flight)
+    await client.connect()
+    if not client.connected:
+        raise RuntimeError(f"Could not connect to {url}")
+
+    recovery_times = []
+
+    async def watch_recovery():
+        # Time from a dropped connection until the next acknowledged request
+        down_since = None
+        acked_at_drop = 0
+        while True:
+            if down_since is None and not client.connected:
+                down_since = time.monotonic()
+                acked_at_drop = client.acked
+            elif down_since is not None and client.connected and client.acked > acked_at_drop:
+                recovery_times.append(time.monotonic() - down_since)
+                down_since = None
+            await asyncio.sleep(0.005)
+
+    watcher = asyncio.create_task(watch_recovery())
+    interval = 1.0 / args.rate
+    total = int(args.rate * args.duration)
+    start = time.monotonic()
+    for i in range(total):
+        await asyncio.sleep(max(0.0, start + i * interval - time.monotonic()))
+        await client.send_transcription(f"benchmark message {i}")
+    send_elapsed = time.monotonic() - start
+
+    # Wait for outstanding acknowledgements
+    drain_deadline = time.monotonic() + args.drain_timeout
+    while client.acked + client.errors + client.ack_timeouts + client.unacknowledged + client.outbound.dropped \
+            < total and time.monotonic() < drain_deadline:
+        await asyncio.sleep(0.01)
+    elapsed = time.monotonic() - start
+
+    watcher.cancel()
+    stats = client.stats()
+    await client.close()
+    if server:
+        await server.stop()
+
+    latency = stats["ack_latency"].get("Speak", {})
+    return {
+        "url": url,
+        "target_rate": args.rate,
+        "messages": total,
+        "send_seconds": send_elapsed,
+        "elapsed_seconds": elapsed,
+        "throughput": stats["acked"] / elapsed if elapsed else 0.0,
+        "acked": stats["acked"],
+        "errors": stats["errors"],
+        "dropped": stats["dropped"],
+        "ack_timeouts": stats["ack_timeouts"],
+        "unacknowledged": stats["unacknowledged"],
+        "reconnects": stats["reconnects"],
+        "latency": latency,
+        "recovery_seconds": recovery_times,
+    }
+
+
+def print_speakerbot_report(result):
+    latency = result["latency"]
+
+    def ms(value):
+        return "-" if value is None else f"{value * 1000:.1f} ms"
+
+    print(f"Target:       {result['messages']} messages at {result['target_rate']:g}/s to {result['url']}")
+    print(f"Throughput:   {result['throughput']:.1f} acked/s over {result['elapsed_seconds']:.2f}s")
+    print(f"Acked:        {result['acked']} (errors {result['errors']}, dropped {result['dropped']}, "
+          f"timeouts {result['ack_timeouts']}, lost at disconnect {result['unacknowledged']})")
+    print(f"Ack latency:  p50 {ms(latency.get('p50'))}  p95 {ms(latency.get('p95'))}  "
+          f"p99 {ms(latency.get('p99'))}  max {ms(latency.get('max'))}")
+    recovery = result["recovery_seconds"]
+    if recovery:
+        print(f"Reconnects:   {result['reconnects']}, recovery mean {ms(sum(recovery) / len(recovery))} "
+              f"max {ms(max(recovery))}")
+    else:
+        print(f"Reconnects:   {result['reconnects']}")
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MiB, or None if unavailable"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def normalize_words(text):
+    """Lowercase words without punctuation, for word error rate"""
+    return re.sub(r"[^\w\s']", " ", text.lower()).split()
+
+
+def word_errors(reference, hypothesis):
+    """Word-level edit distance between two texts and the reference word count"""
+    ref = normalize_words(reference)
+    hyp = normalize_words(hypothesis)
+    previous = list(range(len(hyp) + 1))
+    for i, ref_word in enumerate(ref, 1):
+        current = [i] + [0] * len(hyp)
+        for j, hyp_word in enumerate(hyp, 1):
+            current[j] = min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (ref_word != hyp_word)
+            )
+        previous = current
+    return previous[-1], len(ref)
+
+
+def collect_wav_files(paths):
+    """Expand files and directories into a sorted list of WAV files"""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(sorted(glob.glob(os.path.join(path, "*.wav"))))
+        else:
+            files.append(path)
+    return files
+
+
+def reference_transcript(wav_path):
+    """Text of the .txt file next to a WAV file, or None"""
+    text_path = os.path.splitext(wav_path)[0] + ".txt"
+    if not os.path.exists(text_path):
+        return None
+    with open(text_path, encoding="utf-8") as f:
+        return f.read().strip()
+
+
+def latency_summary(latencies):
+    if not latencies:
+        return {"count": 0}
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+    return {
+        "count": len(latencies), "mean": float(np.mean(latencies)),
+        "p50": float(p50), "p95": float(p95), "p99": float(p99), "max": float(max(latencies)),
+    }
+
+
+def benchmark_stt_config(model_name, engine, files, segmentation):
+    """Transcribe files with one model and engine the way the app does"""
+    started = time.perf_counter()
+    transcriber = WhisperTranscriber(model_name, engine)
+    load_seconds = time.perf_counter() - started
+
+    file_results = []
+    latencies = []
+    for path in files:
+        samples = load_wav(path)
+        # Same chunking and silence gating as microphone input
+        recorder = AudioRecorder(segmentation_mode=segmentation, streaming=False)
+        chunks = []
+        for offset in range(0, len(samples), AudioRecorder.FRAMES_PER_BUFFER):
+            chunks.extend(recorder.feed(samples[offset:offset + AudioRecorder.FRAMES_PER_BUFFER]))
+        chunks.extend(recorder.flush())
+
+        texts = []
+        transcribe_seconds = 0.0
+        for chunk in chunks:
+            chunk_started = time.perf_counter()
+            text = transcriber.transcribe(chunk.audio)
+            latency = time.perf_counter() - chunk_started
+            latencies.append(latency)
+            transcribe_seconds += latency
+            if text:
+                texts.append(text)
+
+        audio_seconds = len(samples) / main.SAMPLE_RATE
+        hypothesis = " ".join(texts)
+        reference = reference_transcript(path)
+        result = {
+            "file": path,
+            "audio_seconds": audio_seconds,
+            "chunks": len(chunks),
+            "skipped_chunks": recorder.skipped_chunks,
+            "transcribe_seconds": transcribe_seconds,
+            "rtf": transcribe_seconds / audio_seconds if audio_seconds else None,
+            "hypothesis": hypothesis,
+            "reference": reference,
+        }
+        if reference is not None:
+            errors, words = word_errors(reference, hypothesis)
+            result.update(word_errors=errors, reference_words=words, wer=errors / words if words else None)
+        file_results.append(result)
+
+    transcriber.close()
+    audio_seconds = sum(r["audio_seconds"] for r in file_results)
+    transcribe_seconds = sum(r["transcribe_seconds"] for r in file_results)
+    scored = [r for r in file_results if r.get("reference_words")]
+    reference_words = sum(r["reference_words"] for r in scored)
+    return {
+        "model": model_name,
+        "engine": engine,
+        "segmentation": segmentation,
+        "load_seconds": load_seconds,
+        "audio_seconds": audio_seconds,
+        "transcribe_seconds": transcribe_seconds,
+        "rtf": transcribe_seconds / audio_seconds if audio_seconds else None,
+        "chunk_latency": latency_summary(latencies),
+        "peak_rss_mb": peak_rss_mb(),
+        "wer": sum(r["word_errors"] for r in scored) / reference_words if reference_words else None,
+        "files": file_results,
+    }
+
+
+def _run_isolated(target, *args):
+    """Run target(*args) in a fresh process so its peak RSS is its own"""
+    context = multiprocessing.get_context("spawn")
+    with context.Pool(1) as pool:
+        return pool.apply(target, args)
+
+
+def _stt_config_worker(model_name, engine, files, segmentation, verbose):
+    if not verbose:
+        main.logger.setLevel(logging.WARNING)
+    try:
+        return benchmark_stt_config(model_name, engine, files, segmentation)
+    except Exception as e:
+        return {"model": model_name, "engine": engine, "segmentation": segmentation, "error": str(e)}
+
+
+def stt_benchmark(args):
+    """Benchmark every requested model size and STT engine over the WAV corpus"""
+    files = collect_wav_files(args.files)
+    if not files:
+        raise RuntimeError("No WAV files to transcribe")
+    results = []
+    for engine in args.engines:
+        for model_name in args.models:
+            print(f"Benchmarking {engine} / {model_name} on {len(files)} file(s)...", flush=True)
+            results.append(_run_isolated(
+                _stt_config_worker, model_name, engine, files, args.segmentation, args.verbose
+            ))
+    return {"benchmark": "stt", "files": files, "results": results}
+
+
+def print_stt_report(report):
+    def fmt(value, pattern, scale=1.0):
+        return "-" if value is None else pattern.format(value * scale)
+
+    print(f"{'engine':<15} {'model':<10} {'load s':>7} {'RTF':>6} {'p50 ms':>8} {'p95 ms':>8} "
+          f"{'max ms':>8} {'RSS MiB':>8} {'WER':>6}")
+    for result in report["results"]:
+        if "error" in result:
+            print(f"{result['engine']:<15} {result['model']:<10} error: {result['error']}")
+            continue
+        latency = result["chunk_latency"]
+        print(
+            f"{result['engine']:<15} {result['model']:<10} {result['load_seconds']:>7.1f} "
+            f"{fmt(result['rtf'], '{:.3f}'):>6} {fmt(latency.get('p50'), '{:.0f}', 1000):>8} "
+            f"{fmt(latency.get('p95'), '{:.0f}', 1000):>8} {fmt(latency.get('max'), '{:.0f}', 1000):>8} "
+            f"{fmt(result['peak_rss_mb'], '{:.0f}'):>8} {fmt(result['wer'], '{:.1%}'):>6}"
+        )
+
+
+TTS_BACKENDS = {
+    "piper": PiperClient,
+    "styletts2": StyleTTS2Client,
+    "neutts": NeuTTSClient,
+}
+
+# Default TTS corpus: short to long utterances
+TTS_CORPUS = [
+    "Hello there.",
+    "Thanks for the follow, welcome to the stream!",
+    "Give me one second, I need to check the settings before we start the next round.",
+    "So I'm live on radio, and I say, well, my dear friend James here clearly, and the whole room just froze.",
+    "Okay, that was close. Let's try that again, and this time nobody touch the volume knob, please.",
+]
+
+
+class NullAudioSink:
+    """Stands in for AudioPlayer, discarding audio but timing when it arrives"""
+
+    def __init__(self):
+        self.trace = None
+        self.reset()
+
+    def reset(self):
+        self.first_audio = None
+        self.audio_seconds = 0.0
+
+    def play(self, audio_data, sample_rate=24000, final=True, on_start=None, deadline=None):
+        if audio_data is None or not len(audio_data):
+            return
+        if self.first_audio is None:
+            self.first_audio = time.perf_counter()
+        self.audio_seconds += len(audio_data) / sample_rate
+        if on_start:
+            on_start()
+
+    async def play_async(self, audio_data, sample_rate=24000, final=True, on_start=None, deadline=None):
+        self.play(audio_data, sample_rate, final, on_start, deadline)
+
+
+async def benchmark_tts_backend(backend, texts):
+    """Load one TTS backend and synthesize the corpus into a null sink"""
+    sink = NullAudioSink()
+    # No TTS cache, so every utterance is really synthesized
+    client = TTS_BACKENDS[backend](audio_player=sink, cache=None)
+
+    started = time.perf_counter()
+    await client.connect()
+    load_seconds = time.perf_counter() - started
+    if not client.connected:
+        return {"backend": backend, "error": "failed to load (see log for details)"}
+
+    async def synthesize(text):
+        sink.reset()
+        started = time.perf_counter()
+        await client.send_transcription(text)
+        total = time.perf_counter() - started
+        if sink.first_audio is None:
+            raise RuntimeError(f"{backend} produced no audio for: {text}")
+        return sink.first_audio - started, total, sink.audio_seconds
+
+    # The first utterance after loading pays for lazy initialisation and warm-up
+    cold_ttfa, cold_seconds, cold_audio = await synthesize(texts[0])
+    cold_rtf = client.rtf.value
+    client.rtf = RealTimeFactor()
+
+    ttfas = []
+    wall_seconds = 0.0
+    audio_seconds = 0.0
+    for text in texts:
+        ttfa, total, audio = await synthesize(text)
+        ttfas.append(ttfa)
+        wall_seconds += total
+        audio_seconds += audio
+
+    await client.close()
+    return {
+        "backend": backend,
+        "load_seconds": load_seconds,
+        "cold_ttfa": cold_ttfa,
+        "cold_rtf": cold_rtf,
+        "warm_ttfa": latency_summary(ttfas),
+        "rtf": client.rtf.value,
+        "wall_rtf": wall_seconds / audio_seconds if audio_seconds else None,
+        "audio_seconds": audio_seconds,
+        "utterances": len(texts),
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def _tts_backend_worker(backend, texts, verbose):
+    if not verbose:
+        main.logger.setLevel(logging.WARNING)
+    try:
+        return asyncio.run(benchmark_tts_backend(backend, texts))
+    except Exception as e:
+        return {"backend": backend, "error": str(e)}
+
+
+def tts_benchmark(args):
+    """Benchmark every requested TTS backend over the text corpus"""
+    texts = TTS_CORPUS
+    if args.corpus:
+        with open(args.corpus, encoding="utf-8") as f:
+            texts = [line.strip() for line in f if line.strip()]
+    if not texts:
+        raise RuntimeError("The TTS corpus is empty")
+    results = []
+    for backend in args.backends:
+        print(f"Benchmarking {backend} on {len(texts)} utterance(s)...", flush=True)
+        results.append(_run_isolated(_tts_backend_worker, backend, texts, args.verbose))
+    return {"benchmark": "tts", "texts": texts, "results": results}
+
+
+def print_tts_report(report):
+    def fmt(value, pattern, scale=1.0):
+        return "-" if value is None else pattern.format(value * scale)
+
+    print(f"{'backend':<10} {'load s':>7} {'cold TTFA':>10} {'TTFA p50':>9} {'TTFA p95':>9} "
+          f"{'RTF':>6} {'wall RTF':>8} {'RSS MiB':>8}")
+    for result in report["results"]:
+        if "error" in result:
+            print(f"{result['backend']:<10} error: {result['error']}")
+            continue
+        ttfa = result["warm_ttfa"]
+        print(
+            f"{result['backend']:<10} {result['load_seconds']:>7.1f} "
+            f"{fmt(result['cold_ttfa'], '{:.0f} ms', 1000):>10} {fmt(ttfa.get('p50'), '{:.0f} ms', 1000):>9} "
+            f"{fmt(ttfa.get('p95'), '{:.0f} ms', 1000):>9} {fmt(result['rtf'], '{:.3f}'):>6} "
+            f"{fmt(result['wall_rtf'], '{:.3f}'):>8} {fmt(result['peak_rss_mb'], '{:.0f}'):>8}"
+        )
+
+
+def write_json(result, path):
+    if path:
+        with open(path, "w") as f:
+            json.dump(result, f, indent=2)
+        print(f"Results written to {path}")
+
+
+def parse_args(argv=None):
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description="speech-to-text-to-speech benchmarks")
+    parser.add_argument("--verbose", action="store_true", help="Show application log messages")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    def add_mock_options(subparser):
+        subparser.add_argument("--port", type=int, default=7585, help="Mock server port")
+        subparser.add_argument("--ack-delay", type=float, default=0.02, help="Seconds before each ack")
+        subparser.add_argument("--jitter", type=float, default=0.01, help="Extra random ack delay in seconds")
+        subparser.add_argument("--disconnect-every", type=float, default=0.0,
+                               help="Drop all connections every N seconds (0 disables)")
+
+    mock_parser = subparsers.add_parser("mock-speakerbot", help="Run a local mock Speakerbot server")
+    mock_parser.add_argument("--host", default="127.0.0.1", help="Address to listen on")
+    add_mock_options(mock_parser)
+
+    load_parser = subparsers.add_parser("speakerbot", help="Load-test SpeakerbotClient")
+    add_mock_options(load_parser)
+    load_parser.add_argument("--url", default="", help="Existing Speakerbot URL (default: start a mock server)")
+    load_parser.add_argument("--rate", type=float, default=20.0, help="Messages per second")
+    load_parser.add_argument("--duration", type=float, default=10.0, help="Seconds to send for")
+    load_parser.add_argument("--max-in-flight", type=int, default=main.SPEAKERBOT_MAX_IN_FLIGHT,
+                             help="Unacknowledged requests allowed at once (0 = unlimited)")
+    load_parser.add_argument("--queue-size", type=int, default=main.SPEAKERBOT_SEND_QUEUE_SIZE,
+                             help="Client outbound queue size")
+    load_parser.add_argument("--drain-timeout", type=float, default=10.0,
+                             help="Seconds to wait for outstanding acks after sending")
+    load_parser.add_argument("--json", default="", help="Also write results to this JSON file")
+
+    stt_parser = subparsers.add_parser("stt", help="Benchmark transcription over WAV files")
+    stt_parser.add_argument("files", nargs="*", default=["samples/reference.wav"],
+                            help="WAV files or directories; a .txt next to each WAV is its reference transcript")
+    stt_parser.add_argument("--models", nargs="+", default=[main.WHISPER_MODEL], help="Whisper model sizes")
+    stt_parser.add_argument("--engines", nargs="+", default=[main.STT_ENGINE], help="STT engines")
+    stt_parser.add_argument("--segmentation", choices=["vad", "fixed"], default=main.SEGMENTATION_MODE,
+                            help="Chunking mode, as SEGMENTATION_MODE")
+    stt_parser.add_argument("--json", default="", help="Also write results to this JSON file")
+
+    tts_parser = subparsers.add_parser("tts", help="Benchmark local TTS backends")
+    tts_parser.add_argument("--backends", nargs="+", choices=sorted(TTS_BACKENDS), default=sorted(TTS_BACKENDS),
+                            help="TTS backends to compare")
+    tts_parser.add_argument("--corpus", default="", help="Text file with one utterance per line")
+    tts_parser.add_argument("--json", default="", help="Also write results to this JSON file")
+
+    return parser.parse_args(argv)
+
+
+def run_benchmark():
+    """Benchmark entry point"""
+    args = parse_args()
+    if not args.verbose:
+        main.logger.setLevel(logging.WARNING)
+        logging.getLogger("websockets").setLevel(logging.WARNING)
+
+    try:
+        if args.command == "mock-speakerbot":
+            asyncio.run(run_mock_server(args))
+        elif args.command == "speakerbot":
+            result = asyncio.run(speakerbot_load(args))
+            print_speakerbot_report(result)
+            write_json(result, args.json)
+        elif args.command == "stt":
+            report = stt_benchmark(args)
+            print_stt_report(report)
+            write_json(report, args.json)
+        elif args.command == "tts":
+            report = tts_benchmark(args)
+            print_tts_report(report)
+            write_json(report, args.json)
+    except KeyboardInterrupt:
+        pass
+    except Exception as e:
+        main.logger.error(f"Benchmark error: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -5,13 +5,26 @@ Captures audio from microphone, transcribes using Whisper, and sends to TTS serv
 """
 import os
 import sys
+import glob
+import argparse
 import time
 import queue
 import json
 import asyncio
 import logging
 import random
-from threading import Thread
+import math
+import re
+import hashlib
+import functools
+import itertools
+import multiprocessing
+import unicodedata
+import wave
+from math import gcd
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from threading import Condition, Lock, Thread
 from dotenv import load_dotenv
 import numpy as np
 import pyaudio
@@ -29,6 +42,20 @@ TTS_SERVICE = os.getenv("TTS_SERVICE", "speakerbot").lower()
 # Speakerbot settings
 WEBSOCKET_URL = os.getenv("SPEAKERBOT_WEBSOCKET_URL", "ws://localhost:7585/speak")
 VOICE_NAME = os.getenv("VOICE_NAME", "Sally")
+# Keepalive: seconds between pings and seconds to wait for the pong before reconnecting (0 disables)
+SPEAKERBOT_PING_INTERVAL = float(os.getenv("SPEAKERBOT_PING_INTERVAL", "10"))
+SPEAKERBOT_PING_TIMEOUT = float(os.getenv("SPEAKERBOT_PING_TIMEOUT", "10"))
+# Reconnect backoff: first and maximum delay in seconds (full jitter is applied)
+SPEAKERBOT_RECONNECT_MIN = float(os.getenv("SPEAKERBOT_RECONNECT_MIN", "0.5"))
+SPEAKERBOT_RECONNECT_MAX = float(os.getenv("SPEAKERBOT_RECONNECT_MAX", "30"))
+# Transcriptions held while disconnected; the oldest are dropped when full
+SPEAKERBOT_SEND_QUEUE_SIZE = int(os.getenv("SPEAKERBOT_SEND_QUEUE_SIZE", "32"))
+# Seconds a queued transcription may wait for the connection before it is dropped (0 = no limit)
+SPEAKERBOT_SEND_TTL = float(os.getenv("SPEAKERBOT_SEND_TTL", "120"))
+# Requests sent but not yet acknowledged before further sends wait (0 = unlimited)
+SPEAKERBOT_MAX_IN_FLIGHT = int(os.getenv("SPEAKERBOT_MAX_IN_FLIGHT", "4"))
+# Seconds to wait for a response before a request stops counting as in flight
+SPEAKERBOT_ACK_TIMEOUT = float(os.getenv("SPEAKERBOT_ACK_TIMEOUT", "5"))
 
 # NeuTTS Air settings
 NEUTTS_BACKBONE = os.getenv("NEUTTS_BACKBONE", "neuphonic/neutts-air-q4-gguf")
@@ -37,20 +64,86 @@ NEUTTS_CODEC = os.getenv("NEUTTS_CODEC", "neuphonic/neucodec")
 NEUTTS_CODEC_DEVICE = os.getenv("NEUTTS_CODEC_DEVICE", "cpu")
 NEUTTS_REF_AUDIO = os.getenv("NEUTTS_REF_AUDIO", "")
 NEUTTS_REF_TEXT = os.getenv("NEUTTS_REF_TEXT", "")
+# Directory for encoded reference voices (empty disables persisting them)
+NEUTTS_REF_CACHE_DIR = os.getenv("NEUTTS_REF_CACHE_DIR", "cache/neutts_refs")
+# Play codec-decoded audio while a GGUF backbone is still generating tokens
+NEUTTS_STREAMING = os.getenv("NEUTTS_STREAMING", "true").lower() in ("1", "true", "yes")
 
 # Piper TTS settings
 PIPER_VOICE_PATH = os.getenv("PIPER_VOICE_PATH", "")
+# Play each synthesized sentence as soon as Piper yields it instead of waiting for the whole text
+PIPER_STREAMING = os.getenv("PIPER_STREAMING", "true").lower() in ("1", "true", "yes")
 
 # StyleTTS2 settings
 STYLETTS2_REF_AUDIO = os.getenv("STYLETTS2_REF_AUDIO", "")
+# Directory for computed reference style vectors (empty keeps them in memory only)
+STYLETTS2_STYLE_CACHE_DIR = os.getenv("STYLETTS2_STYLE_CACHE_DIR", "cache/styletts2_styles")
+
+# TTS synthesis cache settings
+# In-memory LRU budget and on-disk store for synthesized phrases (0 / empty disables a tier)
+TTS_CACHE_MEMORY_MB = float(os.getenv("TTS_CACHE_MEMORY_MB", "64"))
+TTS_CACHE_DIR = os.getenv("TTS_CACHE_DIR", "cache/tts")
+TTS_CACHE_DISK_MB = float(os.getenv("TTS_CACHE_DISK_MB", "512"))
+
+# Synthesize NeuTTS/StyleTTS2 text sentence by sentence, playing each one while the next is synthesized
+TTS_SENTENCE_SPLIT = os.getenv("TTS_SENTENCE_SPLIT", "true").lower() in ("1", "true", "yes")
+# Sentences longer than this many characters are further split at clause boundaries
+TTS_MAX_SEGMENT_CHARS = int(os.getenv("TTS_MAX_SEGMENT_CHARS", "120"))
 
 # Whisper and audio settings
 WHISPER_MODEL = os.getenv("WHISPER_MODEL", "base")
+# STT engine: whisper (openai-whisper, PyTorch) or faster-whisper (CTranslate2)
+STT_ENGINE = os.getenv("STT_ENGINE", "whisper").lower()
+# faster-whisper settings
+STT_DEVICE = os.getenv("STT_DEVICE", "cpu")
+STT_COMPUTE_TYPE = os.getenv("STT_COMPUTE_TYPE", "int8")
+STT_CPU_THREADS = int(os.getenv("STT_CPU_THREADS", "0"))
+# Maximum number of queued chunks decoded together when the STT stage falls behind (1 disables)
+STT_BATCH_SIZE = int(os.getenv("STT_BATCH_SIZE", "4"))
 SAMPLE_RATE = int(os.getenv("SAMPLE_RATE", "16000"))
 CHUNK_DURATION = float(os.getenv("CHUNK_DURATION", "3.0"))
 SILENCE_THRESHOLD = float(os.getenv("SILENCE_THRESHOLD", "0.01"))
 MIN_SPEECH_DURATION = float(os.getenv("MIN_SPEECH_DURATION", "0.5"))
 
+# Speech segmentation settings
+# "vad" ends an utterance as soon as the speaker pauses, "fixed" cuts CHUNK_DURATION blocks
+SEGMENTATION_MODE = os.getenv("SEGMENTATION_MODE", "vad").lower()
+VAD_FRAME_DURATION = float(os.getenv("VAD_FRAME_DURATION", "0.03"))
+VAD_PRE_ROLL = float(os.getenv("VAD_PRE_ROLL", "0.3"))
+VAD_HANGOVER = float(os.getenv("VAD_HANGOVER", "0.5"))
+MAX_UTTERANCE_DURATION = float(os.getenv("MAX_UTTERANCE_DURATION", "15.0"))
+
+# Streaming transcription settings (requires SEGMENTATION_MODE=vad)
+# Re-decode the utterance in progress every STREAMING_STEP seconds and commit stable words early
+STT_STREAMING = os.getenv("STT_STREAMING", "false").lower() in ("1", "true", "yes")
+STREAMING_STEP = float(os.getenv("STREAMING_STEP", "0.5"))
+
+# Pipeline queue settings
+# Overflow policies: block (apply backpressure), drop_oldest, merge (join with the newest item)
+AUDIO_QUEUE_SIZE = int(os.getenv("AUDIO_QUEUE_SIZE", "4"))
+AUDIO_QUEUE_OVERFLOW = os.getenv("AUDIO_QUEUE_OVERFLOW", "merge").lower()
+TEXT_QUEUE_SIZE = int(os.getenv("TEXT_QUEUE_SIZE", "8"))
+TEXT_QUEUE_OVERFLOW = os.getenv("TEXT_QUEUE_OVERFLOW", "merge").lower()
+PLAYBACK_QUEUE_SIZE = int(os.getenv("PLAYBACK_QUEUE_SIZE", "8"))
+PLAYBACK_QUEUE_OVERFLOW = os.getenv("PLAYBACK_QUEUE_OVERFLOW", "block").lower()
+# Output stream settings: frames per device callback and seconds of audio buffered ahead of the device
+PLAYBACK_BUFFER_FRAMES = int(os.getenv("PLAYBACK_BUFFER_FRAMES", "512"))
+PLAYBACK_RING_DURATION = float(os.getenv("PLAYBACK_RING_DURATION", "2.0"))
+# Output stream sample rate; every clip is resampled to it (0 uses the device's native rate)
+PLAYBACK_SAMPLE_RATE = int(os.getenv("PLAYBACK_SAMPLE_RATE", "0"))
+# Latency budget in seconds between queueing a clip and playing it (0 disables)
+PLAYBACK_MAX_LATENCY = float(os.getenv("PLAYBACK_MAX_LATENCY", "8.0"))
+# What to do with clips that would start after their deadline: drop or fast_forward
+PLAYBACK_LATE_POLICY = os.getenv("PLAYBACK_LATE_POLICY", "drop").lower()
+# Seconds after transcription by which speech must start playing; later synthesis is cancelled (0 disables)
+SYNTHESIS_DEADLINE = float(os.getenv("SYNTHESIS_DEADLINE", str(PLAYBACK_MAX_LATENCY)))
+PIPELINE_STATS_INTERVAL = float(os.getenv("PIPELINE_STATS_INTERVAL", "30"))
+# Completed utterances kept per stage for rolling latency percentiles
+LATENCY_WINDOW = int(os.getenv("LATENCY_WINDOW", "200"))
+# Prometheus metrics endpoint (METRICS_PORT=0 disables it)
+METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+METRICS_PORT = int(os.getenv("METRICS_PORT", "0"))
+
 # Setup logging
 logging.basicConfig(
     level=logging.INFO,
@@ -208,13 +301,543 @@ class AudioDeviceSelector:
         return self.input_device_index, self.output_device_index
 
 
+class StageQueue:
+    """Bounded, thread-safe queue joining two pipeline stages
+
+    When the queue is full, ``put`` applies the overflow policy:
+
+    - ``block``: wait until the consumer makes room (backpressure)
+    - ``drop_oldest``: discard the oldest queued item
+    - ``merge``: combine the new item into the newest queued item using
+      ``merge(newest, item)``; if that returns None the put blocks instead
+
+    ``get`` raises ``queue.Empty`` like ``queue.Queue`` so it can be used as a
+    drop-in replacement. Depth and drop counters are exposed via ``stats()``,
+    and ``on_drop`` is called with every item discarded by ``drop_oldest``.
+    """
+
+    POLICIES = ("block", "drop_oldest", "merge")
+
+    def __init__(self, name, maxsize, policy="block", merge=None, on_drop=None):
+        if policy not in self.POLICIES:
+            raise ValueError(f"Unknown overflow policy for {name} queue: {policy}")
+        if policy == "merge" and merge is None:
+            raise ValueError(f"The {name} queue needs a merge function for the merge policy")
+        self.name = name
+        self.maxsize = max(int(maxsize), 1)
+        self.policy = policy
+        self._merge = merge
+        self._on_drop = on_drop
+        self._items = deque()
+        self._cond = Condition()
+        self._async_waiters = {}
+        self.closed = False
+        self.put_count = 0
+        self.dropped = 0
+        self.merged = 0
+        self.high_watermark = 0
+
+    def qsize(self):
+        return len(self._items)
+
+    def empty(self):
+        return not self._items
+
+    def _notify(self):
+        """Wake blocked threads and coroutines; call with the lock held"""
+        self._cond.notify_all()
+        for waiter, loop in self._async_waiters.items():
+            try:
+                loop.call_soon_threadsafe(self._wake, waiter)
+            except RuntimeError:
+                pass  # The waiting loop has already closed
+        self._async_waiters.clear()
+
+    @staticmethod
+    def _wake(waiter):
+        if not waiter.done():
+            waiter.set_result(None)
+
+    def _add_async_waiter(self):
+        """Future resolved by the next change to the queue; call with the lock held"""
+        loop = asyncio.get_running_loop()
+        waiter = loop.create_future()
+        self._async_waiters[waiter] = loop
+        return waiter
+
+    async def _wait_async(self, waiter, timeout=None):
+        """Await a waiter, returning False on timeout"""
+        try:
+            await asyncio.wait_for(waiter, timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            with self._cond:
+                self._async_waiters.pop(waiter, None)
+
+    def put(self, item, timeout=None):
+        """Queue an item, returning False if a blocking put timed out or the queue is closed"""
+        with self._cond:
+            if self.closed:
+                return False
+            if len(self._items) >= self.maxsize:
+                if self.policy == "drop_oldest":
+                    dropped = self._items.popleft()
+                    self.dropped += 1
+                    if self._on_drop is not None:
+                        self._on_drop(dropped)
+                elif self.policy == "merge":
+                    merged = self._merge(self._items[-1], item)
+                    if merged is not None:
+                        self._items[-1] = merged
+                        self.merged += 1
+                        self.put_count += 1
+                        self._notify()
+                        return True
+
+            if not self._cond.wait_for(lambda: self.closed or len(self._items) < self.maxsize, timeout):
+                return False
+            if self.closed:
+                return False
+
+            self._items.append(item)
+            self.put_count += 1
+            self.high_watermark = max(self.high_watermark, len(self._items))
+            self._notify()
+            return True
+
+    async def put_async(self, item):
+        """Queue an item from a coroutine without blocking the event loop
+
+        Returns False if the queue is closed.
+        """
+        while True:
+            with self._cond:
+                if self.put(item, timeout=0):
+                    return True
+                if self.closed:
+                    return False
+                waiter = self._add_async_waiter()
+            await self._wait_async(waiter)
+
+    def get(self, timeout=None):
+        """Remove and return the oldest item, raising queue.Empty on timeout"""
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._items, timeout):
+                raise queue.Empty
+            item = self._items.popleft()
+            self._notify()
+            return item
+
+    def get_nowait(self):
+        return self.get(timeout=0)
+
+    def peek(self):
+        """The oldest queued item without removing it, or None"""
+        with self._cond:
+            return self._items[0] if self._items else None
+
+    def discard_before_last(self, predicate):
+        """Remove and return the queued items in front of the newest one matching predicate
+
+        Nothing is removed when no queued item matches.
+        """
+        with self._cond:
+            for index in range(len(self._items) - 1, -1, -1):
+                if predicate(self._items[index]):
+                    break
+            else:
+                return []
+            items = [self._items.popleft() for _ in range(index)]
+            if items:
+                self._notify()
+        return items
+
+    def drain(self, max_items, predicate=None):
+        """Remove up to max_items queued items from the head without waiting
+
+        Stops at the first item for which ``predicate`` returns False.
+        """
+        items = []
+        with self._cond:
+            while self._items and len(items) < max_items:
+                if predicate is not None and not predicate(self._items[0]):
+                    break
+                items.append(self._items.popleft())
+            if items:
+                self._notify()
+        return items
+
+    async def get_async(self, timeout=None):
+        """Await the oldest item from a coroutine, returning None on timeout"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._cond:
+                if self._items:
+                    return self.get_nowait()
+                waiter = self._add_async_waiter()
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                with self._cond:
+                    self._async_waiters.pop(waiter, None)
+                return None
+            if not await self._wait_async(waiter, remaining):
+                return None
+
+    def close(self):
+        """Refuse further items and release every blocked producer"""
+        with self._cond:
+            self.closed = True
+            self._notify()
+
+    def clear(self):
+        """Discard all queued items"""
+        with self._cond:
+            self._items.clear()
+            self._notify()
+
+    def stats(self):
+        """Snapshot of queue depth and overflow counters"""
+        return {
+            "depth": len(self._items),
+            "maxsize": self.maxsize,
+            "policy": self.policy,
+            "put": self.put_count,
+            "dropped": self.dropped,
+            "merged": self.merged,
+            "high_watermark": self.high_watermark,
+        }
+
+
+# Stage name -> (start event, end event) of an utterance trace
+TRACE_STAGES = {
+    "gate": ("capture_end", "gate"),
+    "stt_queue": ("gate", "stt_start"),
+    "stt": ("stt_start", "stt_end"),
+    "tts_queue": ("stt_end", "tts_start"),
+    "tts_first_chunk": ("tts_start", "first_chunk"),
+    "tts_first_audio": ("tts_start", "first_audio"),
+    "tts_ack": ("tts_start", "tts_ack"),
+    "playback": ("first_audio", "playback_end"),
+    "end_to_end": ("capture_end", "first_audio"),
+}
+
+
+class UtteranceTrace:
+    """Timestamps of one utterance as it moves through the pipeline
+
+    Events are ``time.monotonic()`` values: capture_end (the speaker stopped),
+    gate (the segmenter cut the utterance), stt_start/stt_end, tts_start,
+    first_chunk (the first synthesized audio was queued), first_audio (its
+    first sample reached the device; tts_ack for Speakerbot) and playback_end.
+    ``finish()`` hands the trace to the latency tracker.
+    """
+
+    _ids = itertools.count(1)
+
+    def __init__(self, capture_end=None):
+        self.trace_id = next(self._ids)
+        self.backend = None
+        self.events = {}
+        self.finished = False
+        if capture_end is not None:
+            self.events["capture_end"] = capture_end
+
+    def mark(self, event, timestamp=None):
+        """Record when event happened (now by default); the first mark wins"""
+        self.events.setdefault(event, time.monotonic() if timestamp is None else timestamp)
+
+    def finish(self, event=None):
+        """Mark a closing event and report the trace once"""
+        if event:
+            self.mark(event)
+        if self.finished:
+            return
+        self.finished = True
+        latency_tracker.record(self)
+
+    def durations(self):
+        """Seconds spent in each stage that both of its events were recorded for"""
+        events = dict(self.events)
+        if "first_audio" not in events and "tts_ack" in events:
+            # Speakerbot speaks remotely; its ack is the closest thing to first audio
+            events["first_audio"] = events["tts_ack"]
+        return {
+            stage: events[end] - events[start]
+            for stage, (start, end) in TRACE_STAGES.items()
+            if start in events and end in events
+        }
+
+
+class LatencyTracker:
+    """Rolling per-stage latency percentiles of finished utterance traces
+
+    The last ``window`` durations are kept for every (backend, stage) pair;
+    stages before TTS are reported under the "stt" backend. The number and
+    sum of all durations ever recorded are kept as well.
+    """
+
+    TTS_STAGES = ("tts_first_chunk", "tts_first_audio", "tts_ack", "playback", "end_to_end")
+
+    def __init__(self, window=LATENCY_WINDOW):
+        self.window = max(int(window), 1)
+        self._samples = {}
+        # (backend, stage) -> [count, sum] over every recorded duration
+        self._totals = {}
+        self._lock = Lock()
+        self.traces = 0
+
+    def record(self, trace):
+        durations = trace.durations()
+        logger.debug(
+            f"Trace {trace.trace_id}: "
+            + ", ".join(f"{stage}={seconds * 1000:.0f}ms" for stage, seconds in durations.items())
+        )
+        with self._lock:
+            self.traces += 1
+            for stage, seconds in durations.items():
+                backend = (trace.backend or "none") if stage in self.TTS_STAGES else "stt"
+                samples = self._samples.get((backend, stage))
+                if samples is None:
+                    samples = self._samples[(backend, stage)] = deque(maxlen=self.window)
+                samples.append(seconds)
+                totals = self._totals.setdefault((backend, stage), [0, 0.0])
+                totals[0] += 1
+                totals[1] += seconds
+
+    def stats(self):
+        """{backend: {stage: {count, p50, p95, p99, total, sum}}} in seconds
+
+        ``count`` and the percentiles cover the window; ``total`` and ``sum``
+        cover every duration recorded.
+        """
+        with self._lock:
+            snapshot = {key: np.array(samples) for key, samples in self._samples.items()}
+            totals = {key: tuple(value) for key, value in self._totals.items()}
+        stats = {}
+        for (backend, stage), samples in sorted(snapshot.items()):
+            p50, p95, p99 = np.percentile(samples, [50, 95, 99])
+            total, seconds = totals[(backend, stage)]
+            stats.setdefault(backend, {})[stage] = {
+                "count": len(samples), "p50": float(p50), "p95": float(p95), "p99": float(p99),
+                "total": total, "sum": seconds
+            }
+        return stats
+
+    def reset(self):
+        with self._lock:
+            self._samples.clear()
+            self._totals.clear()
+            self.traces = 0
+
+
+latency_tracker = LatencyTracker()
+
+
+class RealTimeFactor:
+    """Accumulates processing time against the duration of the audio processed
+
+    A real-time factor below 1 means audio is processed faster than it plays.
+    """
+
+    def __init__(self):
+        self.processing_seconds = 0.0
+        self.audio_seconds = 0.0
+        self.count = 0
+        self._lock = Lock()
+
+    def add(self, processing_seconds, audio_seconds):
+        with self._lock:
+            self.processing_seconds += processing_seconds
+            self.audio_seconds += audio_seconds
+            self.count += 1
+
+    @property
+    def value(self):
+        return self.processing_seconds / self.audio_seconds if self.audio_seconds else 0.0
+
+
+def merge_audio_chunks(older, newer):
+    """Merge two queued audio chunks into one
+
+    A streaming snapshot supersedes an older snapshot of the same utterance;
+    snapshots of different utterances cannot be merged. Merged audio keeps
+    the newer chunk's trace, whose speech ended last.
+    """
+    if isinstance(older, StreamingChunk) or isinstance(newer, StreamingChunk):
+        if (isinstance(older, StreamingChunk) and isinstance(newer, StreamingChunk)
+                and older.utterance_id == newer.utterance_id and not older.final):
+            return newer
+        return None
+    return AudioChunk(np.concatenate([older.audio, newer.audio]), newer.trace, older.start)
+
+
+def merge_synthesis_jobs(older, newer):
+    """Merge two queued synthesis jobs into one that is due with the newer one
+
+    The merged job keeps the older job's trace, since its words have waited longest.
+    """
+    if newer.trace is not None:
+        newer.trace.finish()
+    return SynthesisJob(f"{older.text} {newer.text}", newer.deadline, older.trace)
+
+
+class SynthesisCancelled(Exception):
+    """Raised inside a synthesis job that was cancelled or missed its deadline"""
+
+
+class SynthesisJob:
+    """A transcription to synthesize, with a deadline for its audio to start playing
+
+    Synthesis code calls ``check()`` between chunks or sentences, so a job that
+    was cancelled or can no longer start in time stops using the CPU. Once its
+    first audio is queued (``start()``) the deadline no longer applies, and
+    only ``cancel()`` or the ``superseded`` callable stops the job.
+    """
+
+    def __init__(self, text, deadline=None, trace=None):
+        self.text = text
+        self.deadline = deadline
+        self.trace = trace
+        self.started = False
+        # Returns True when newer work should take over from a started job
+        self.superseded = None
+        self._cancelled = False
+
+    @classmethod
+    def from_transcription(cls, text, budget=SYNTHESIS_DEADLINE, trace=None):
+        """Create a job for text that must start playing within budget seconds"""
+        return cls(text, time.monotonic() + budget if budget > 0 else None, trace)
+
+    def start(self):
+        """Mark the job's first audio as queued for playback"""
+        self.started = True
+
+    def cancel(self):
+        self._cancelled = True
+
+    @property
+    def expired(self):
+        return not self.started and self.deadline is not None and time.monotonic() > self.deadline
+
+    @property
+    def cancelled(self):
+        return self._cancelled or self.expired
+
+    def check(self):
+        """Raise SynthesisCancelled if the job should stop"""
+        if self._cancelled:
+            raise SynthesisCancelled("cancelled")
+        if self.expired:
+            raise SynthesisCancelled(f"{time.monotonic() - self.deadline:.2f}s past its deadline")
+        if self.started and self.superseded is not None and self.superseded():
+            raise SynthesisCancelled("superseded by newer speech")
+
+
+def merge_playback_clips(older, newer):
+    """Merge two queued playback clips if their sample rates match
+
+    The merged clip keeps the older clip's trace; a different trace on the
+    newer clip is closed, since its utterance no longer plays on its own.
+    """
+    if older.sample_rate != newer.sample_rate:
+        return None
+    if older.trace is not None and newer.trace is not None and newer.trace is not older.trace:
+        newer.trace.finish()
+    return PlaybackClip(
+        np.concatenate([older.audio_data, newer.audio_data]),
+        older.sample_rate,
+        final=newer.final,
+        on_start=older.on_start or newer.on_start,
+        deadline=older.deadline if older.deadline is not None else newer.deadline,
+        trace=older.trace or newer.trace,
+        first=older.first
+    )
+
+
+class PlaybackClip:
+    """Audio queued for playback
+
+    Non-final clips are followed by more audio of the same utterance, which
+    the player plays back to back. ``first`` marks the clip that starts an
+    utterance. ``on_start`` is called once the clip's first sample has been
+    handed to the device. ``deadline`` is the ``time.monotonic()`` value by
+    which the utterance must start playing; it only applies to first clips.
+    ``trace`` is the utterance trace that playback events are recorded on.
+    """
+
+    def __init__(self, audio_data, sample_rate, final=True, on_start=None, deadline=None, trace=None,
+                 first=True):
+        self.audio_data = audio_data
+        self.sample_rate = sample_rate
+        self.final = final
+        self.on_start = on_start
+        self.deadline = deadline
+        self.trace = trace
+        self.first = first
+
+
 class AudioPlayer:
-    """Plays audio through output device with queue"""
+    """Plays audio through one persistent output stream with queue
+
+    Clips are copied from the playback queue into a PCM ring buffer, which a
+    long-lived callback-mode PyAudio stream drains. Consecutive clips play
+    gaplessly and the stream outputs silence while the buffer is empty. Every
+    clip is resampled to the stream's rate (the device's native rate unless
+    ``output_rate`` is given), so one stream serves all TTS backends.
+
+    An utterance that cannot start within ``max_latency`` seconds of its
+    first clip being queued (or by its explicit deadline) is dropped, or
+    fast-forwarded past the late part, so the voice never falls further and
+    further behind the speaker. If newer utterances are already queued behind
+    a late one, the backlog is skipped up to the newest of them. Once an
+    utterance starts on time, the rest of it plays in full.
+    """
     
-    def __init__(self, device_index=None):
+    def __init__(self, device_index=None, queue_size=PLAYBACK_QUEUE_SIZE,
+                 overflow=PLAYBACK_QUEUE_OVERFLOW, buffer_frames=PLAYBACK_BUFFER_FRAMES,
+                 ring_duration=PLAYBACK_RING_DURATION, output_rate=PLAYBACK_SAMPLE_RATE,
+                 max_latency=PLAYBACK_MAX_LATENCY, late_policy=PLAYBACK_LATE_POLICY):
+        if late_policy not in ("drop", "fast_forward"):
+            raise ValueError(f"Unknown late playback policy: {late_policy}")
         self.device_index = device_index
-        self.playback_queue = queue.Queue()
+        self.output_rate = output_rate or None
+        self.playback_queue = StageQueue("playback", queue_size, overflow, merge=merge_playback_clips)
         self.running = False
+        self.buffer_frames = buffer_frames
+        self.ring_duration = ring_duration
+        self.stream_rate = None
+        self._pyaudio = None
+        self._stream = None
+        self._ring = None
+        self._ring_lock = Lock()
+        # Absolute sample positions: written into the ring buffer / handed to the device
+        self._written = 0
+        self._played = 0
+        # (position, callback) pairs fired once playback reaches the position
+        self._markers = deque()
+        # True while more audio of the current utterance is expected
+        self._expecting_audio = False
+        self.underruns = 0
+        self.max_latency = max_latency
+        self.late_policy = late_policy
+        # Set while the remaining clips of a stale utterance are being discarded
+        self._dropping_utterance = False
+        # Seconds of a late utterance still to skip under the fast_forward policy
+        self._fast_forward = 0.0
+        # True while a queued utterance awaits its final clip (producer side)
+        self._queued_open = False
+        self.dropped_clips = 0
+        self.dropped_seconds = 0.0
+        self.late_clips = 0
+        self.skipped_seconds = 0.0
+        # Trace of the utterance being synthesized; clips queued meanwhile carry it
+        self.trace = None
+        # Synthesis job being played; its first queued audio marks it started
+        self.job = None
+        # True while a clip taken from the queue is being copied into the ring buffer
+        self._buffering = False
         
     def start(self):
         """Start audio playback thread"""
@@ -225,64 +848,674 @@ class AudioPlayer:
         logger.info("Audio playback started")
         
     def stop(self):
-        """Stop audio playback thread"""
+        """Stop audio playback thread
+
+        Producers blocked in ``play`` are released and later clips are
+        ignored; the job being played is cancelled so its synthesis stops.
+        """
         self.running = False
+        self.playback_queue.close()
+        if self.job is not None:
+            self.job.cancel()
         if hasattr(self, 'thread'):
             self.thread.join()
         logger.info("Audio playback stopped")
         
-    def play(self, audio_data, sample_rate=24000):
-        """Queue audio data for playback"""
-        self.playback_queue.put((audio_data, sample_rate))
+    def play(self, audio_data, sample_rate=24000, final=True, on_start=None, deadline=None):
+        """Queue audio data for playback
+
+        Pass ``final=False`` for all but the last chunk of a streamed utterance;
+        playback is only reported complete after the final clip. ``deadline``
+        applies to the first clip of an utterance and defaults to now plus the
+        player's latency budget. Returns False once the player has been stopped.
+        """
+        return self.playback_queue.put(self._make_clip(audio_data, sample_rate, final, on_start, deadline))
+
+    async def play_async(self, audio_data, sample_rate=24000, final=True, on_start=None, deadline=None):
+        """Queue audio data for playback without blocking the event loop"""
+        return await self.playback_queue.put_async(
+            self._make_clip(audio_data, sample_rate, final, on_start, deadline)
+        )
+
+    def _make_clip(self, audio_data, sample_rate, final, on_start, deadline):
+        if self.trace is not None and len(audio_data):
+            self.trace.mark("first_chunk")
+        if self.job is not None and len(audio_data):
+            self.job.start()
+        first = not self._queued_open
+        self._queued_open = not final
+        if deadline is None and first and self.max_latency > 0:
+            deadline = time.monotonic() + self.max_latency
+        return PlaybackClip(audio_data, sample_rate, final, on_start, deadline, self.trace, first)
+
+    def playback_stats(self):
+        """Counters for late, dropped and underrun audio"""
+        return {
+            "dropped_clips": self.dropped_clips,
+            "dropped_seconds": round(self.dropped_seconds, 3),
+            "late_clips": self.late_clips,
+            "skipped_seconds": round(self.skipped_seconds, 3),
+            "underruns": self.underruns,
+            "buffered_seconds": round(self.buffered_samples / self.stream_rate, 3) if self.stream_rate else 0.0,
+        }
+
+    @property
+    def idle(self):
+        """True once every queued clip has been played and its callbacks have run"""
+        return (self.playback_queue.empty() and not self._buffering
+                and self.buffered_samples <= 0 and not self._markers)
+
+    @property
+    def buffered_samples(self):
+        """Samples written to the ring buffer that the device has not played yet"""
+        return self._written - self._played
         
     def _playback_loop(self):
         """Playback loop running in separate thread"""
-        p = pyaudio.PyAudio()
+        self._pyaudio = pyaudio.PyAudio()
         
         try:
+            if not self.output_rate:
+                self.output_rate = self._device_sample_rate()
             while self.running:
+                self._fire_markers()
                 try:
-                    audio_data, sample_rate = self.playback_queue.get(timeout=0.1)
-                    
-                    # Open stream for this audio
-                    stream = p.open(
-                        format=pyaudio.paFloat32,
-                        channels=1,
-                        rate=sample_rate,
-                        output=True,
-                        output_device_index=self.device_index
-                    )
-                    
-                    # Convert to float32 if needed
-                    if audio_data.dtype != np.float32:
-                        audio_data = audio_data.astype(np.float32)
-                    
-                    # Play audio
-                    stream.write(audio_data.tobytes())
-                    stream.stop_stream()
-                    stream.close()
-                    
-                    logger.info("Audio playback completed")
-                    
+                    clip = self.playback_queue.get(timeout=0.01)
+                    self._buffering = True
+                    self._buffer_clip(clip)
                 except queue.Empty:
                     continue
                 except Exception as e:
                     logger.error(f"Error during audio playback: {e}")
+                finally:
+                    self._buffering = False
                     
         finally:
-            p.terminate()
+            self._close_stream()
+            self._pyaudio.terminate()
+
+    def _schedule(self, clip):
+        """Apply the latency budget to a clip, returning the audio still worth playing"""
+        audio_data = clip.audio_data
+        duration = len(audio_data) / clip.sample_rate
+
+        if self._dropping_utterance:
+            # The start of this utterance was already dropped as stale
+            self.dropped_clips += 1
+            self.dropped_seconds += duration
+            self._dropping_utterance = not clip.final
+            return audio_data[:0]
+
+        if not clip.first:
+            # The utterance started on time, so the rest of it plays in full
+            if self._fast_forward > 0:
+                skipped = min(self._fast_forward, duration)
+                self._fast_forward -= skipped
+                self.skipped_seconds += skipped
+                return audio_data[int(skipped * clip.sample_rate):]
+            return audio_data
+
+        self._fast_forward = 0.0
+        if clip.deadline is None or not len(audio_data):
+            return audio_data
+
+        # When the utterance's first sample would reach the device
+        expected_start = time.monotonic()
+        if self.stream_rate:
+            expected_start += self.buffered_samples / self.stream_rate
+        lateness = expected_start - clip.deadline
+        if lateness <= 0:
+            return audio_data
+
+        stale = self.playback_queue.discard_before_last(lambda queued: queued.first)
+        if stale:
+            self._coalesce_backlog(clip, stale, lateness)
+            return audio_data[:0]
+
+        if self.late_policy == "fast_forward":
+            skipped = min(lateness, duration)
+            self._fast_forward = lateness - skipped
+            self.late_clips += 1
+            self.skipped_seconds += skipped
+            logger.warning(f"Playback {lateness:.2f}s behind, skipping ahead")
+            return audio_data[int(skipped * clip.sample_rate):]
+
+        self.dropped_clips += 1
+        self.dropped_seconds += duration
+        self._dropping_utterance = not clip.final
+        logger.warning(f"Dropped stale audio ({duration:.2f}s, {lateness:.2f}s past its deadline)")
+        return audio_data[:0]
+
+    def _coalesce_backlog(self, clip, stale, lateness):
+        """Drop a late utterance and the queued ones behind it, up to the newest"""
+        dropped = [clip] + stale
+        seconds = sum(len(c.audio_data) / c.sample_rate for c in dropped)
+        self.dropped_clips += len(dropped)
+        self.dropped_seconds += seconds
+        self._dropping_utterance = False
+        for c in dropped:
+            if c.trace is not None:
+                # No playback event will close these traces
+                c.trace.finish()
+        logger.warning(
+            f"Playback {lateness:.2f}s behind, skipped {seconds:.2f}s of queued speech to the newest utterance"
+        )
+
+    def _buffer_clip(self, clip):
+        """Copy a clip into the ring buffer as space becomes available"""
+        audio_data = self._schedule(clip)
+        if len(audio_data):
+            # Convert to float32 if needed
+            if audio_data.dtype != np.float32:
+                audio_data = audio_data.astype(np.float32)
+
+            # Convert to the stream's rate so the device never has to be reopened
+            sample_rate = self.output_rate or clip.sample_rate
+            audio_data = resample(audio_data, clip.sample_rate, sample_rate)
+            self._ensure_stream(sample_rate)
+            if clip.on_start:
+                self._markers.append((self._written, clip.on_start))
+            if clip.trace is not None and "first_audio" not in clip.trace.events:
+                self._markers.append((self._written, functools.partial(clip.trace.mark, "first_audio")))
+
+            offset = 0
+            while offset < len(audio_data) and self.running:
+                with self._ring_lock:
+                    count = min(self._ring.free, len(audio_data) - offset)
+                    self._ring.write(audio_data[offset:offset + count])
+                    self._written += count
+                offset += count
+                if offset < len(audio_data):
+                    # Wait for the device to drain some of the buffer
+                    self._fire_markers()
+                    time.sleep(0.005)
+
+        # Only a gap inside an open utterance counts as an underrun
+        self._expecting_audio = not clip.final
+        if clip.final:
+            self._markers.append((self._written, lambda: logger.info("Audio playback completed")))
+            if clip.trace is not None:
+                self._markers.append((self._written, functools.partial(clip.trace.finish, "playback_end")))
+
+    def _device_sample_rate(self):
+        """Native sample rate of the output device"""
+        try:
+            if self.device_index is not None:
+                info = self._pyaudio.get_device_info_by_index(self.device_index)
+            else:
+                info = self._pyaudio.get_default_output_device_info()
+            return int(info.get('defaultSampleRate', 48000))
+        except Exception as e:
+            logger.warning(f"Could not query output device sample rate, using 48000Hz: {e}")
+            return 48000
+
+    def _fire_markers(self):
+        """Run callbacks whose position has been reached by the device"""
+        while self._markers and self._markers[0][0] <= self._played:
+            _, callback = self._markers.popleft()
+            try:
+                callback()
+            except Exception as e:
+                logger.error(f"Error in playback callback: {e}")
+
+    def _stream_callback(self, in_data, frame_count, time_info, status):
+        """PyAudio callback pulling the next samples from the ring buffer"""
+        with self._ring_lock:
+            count = min(frame_count, len(self._ring))
+            data = self._ring.read(count).tobytes()
+            self._played += count
+        if count < frame_count:
+            # Running dry in the middle of an utterance is an audible gap
+            if self._expecting_audio:
+                self.underruns += 1
+            # Pad with float32 silence
+            data += bytes(4 * (frame_count - count))
+        return data, pyaudio.paContinue
+
+    def _ensure_stream(self, sample_rate):
+        """Open the output stream at sample_rate, reopening it only if the rate changed"""
+        if self._stream is not None and self.stream_rate == sample_rate:
+            return
+
+        if self._stream is not None:
+            # Let the device finish the buffered audio before switching rates
+            while self.buffered_samples > 0 and self.running:
+                self._fire_markers()
+                time.sleep(0.005)
+            self._close_stream()
+
+        with self._ring_lock:
+            self._ring = AudioRingBuffer(
+                max(int(sample_rate * self.ring_duration), self.buffer_frames * 2), dtype=np.float32
+            )
+        self._stream = self._pyaudio.open(
+            format=pyaudio.paFloat32,
+            channels=1,
+            rate=sample_rate,
+            output=True,
+            output_device_index=self.device_index,
+            frames_per_buffer=self.buffer_frames,
+            stream_callback=self._stream_callback
+        )
+        self.stream_rate = sample_rate
+        logger.info(f"Opened output stream at {sample_rate}Hz (device {self.device_index})")
+
+    def _close_stream(self):
+        """Close the output stream"""
+        if self._stream is None:
+            return
+        try:
+            self._stream.stop_stream()
+            self._stream.close()
+        except Exception as e:
+            logger.error(f"Error closing output stream: {e}")
+        self._stream = None
+        self.stream_rate = None
+
+
+@functools.lru_cache(maxsize=16)
+def _resample_filter(up, down):
+    """Polyphase bank of a Kaiser-windowed sinc low-pass filter for an up/down rate pair
+
+    Returns a (up, taps) float32 matrix whose row ``p`` holds the filter
+    coefficients ``h[p], h[p + up], ...`` and the filter's half length.
+    """
+    max_rate = max(up, down)
+    half_len = 10 * max_rate
+    n = np.arange(-half_len, half_len + 1)
+    cutoff = 1.0 / max_rate
+    h = cutoff * np.sinc(cutoff * n) * np.kaiser(len(n), 5.0)
+    # Unity DC gain after zero-stuffing by ``up``
+    h *= up / h.sum()
+
+    taps = -(-len(h) // up)
+    h = np.concatenate([h, np.zeros(taps * up - len(h))])
+    return np.ascontiguousarray(h.reshape(taps, up).T, dtype=np.float32), half_len
+
+
+def resample(audio_data, from_rate, to_rate, block_size=16384):
+    """Resample float32 audio with a vectorized polyphase filter
+
+    Equivalent to upsampling by ``up``, low-pass filtering and decimating by
+    ``down`` (``to_rate / from_rate`` in lowest terms), but only the needed
+    filter taps are evaluated. Coefficients are cached per rate pair.
+    """
+    from_rate, to_rate = int(from_rate), int(to_rate)
+    if from_rate == to_rate or len(audio_data) == 0:
+        return audio_data
+
+    divisor = gcd(from_rate, to_rate)
+    up, down = to_rate // divisor, from_rate // divisor
+    bank, half_len = _resample_filter(up, down)
+    taps = bank.shape[1]
+
+    n_out = -(-len(audio_data) * up // down)
+    padded = np.concatenate([
+        np.zeros(taps, dtype=np.float32),
+        np.asarray(audio_data, dtype=np.float32),
+        np.zeros(taps + 1, dtype=np.float32)
+    ])
+    tap_offsets = np.arange(taps)
+    output = np.empty(n_out, dtype=np.float32)
+
+    for start in range(0, n_out, block_size):
+        n = np.arange(start, min(start + block_size, n_out), dtype=np.int64)
+        # Position in the upsampled signal, shifted to compensate the filter delay
+        m = n * down + half_len
+        phases = m % up
+        indices = (m // up)[:, None] - tap_offsets[None, :] + taps
+        output[start:start + len(n)] = np.einsum('ij,ij->i', padded[indices], bank[phases])
+
+    return output
+
+
+def pcm16_to_float32(samples):
+    """Convert int16 PCM samples to float32 in [-1.0, 1.0) with a single copy"""
+    audio_float = samples.astype(np.float32)
+    audio_float *= 1.0 / 32768.0
+    return audio_float
+
+
+def pcm_bytes_to_float32(frames, sample_width, channels=1):
+    """Decode interleaved little-endian PCM bytes to mono float32"""
+    if sample_width == 1:
+        audio = (np.frombuffer(frames, dtype=np.uint8).astype(np.float32) - 128.0) / 128.0
+    elif sample_width == 2:
+        audio = pcm16_to_float32(np.frombuffer(frames, dtype='<i2'))
+    elif sample_width == 4:
+        audio = np.frombuffer(frames, dtype='<i4').astype(np.float32) / 2147483648.0
+    else:
+        raise ValueError(f"Unsupported PCM sample width: {sample_width * 8} bits")
+
+    if channels > 1:
+        audio = audio[:len(audio) - len(audio) % channels].reshape(-1, channels).mean(axis=1)
+    return audio
+
+
+def float32_to_pcm16(audio_data):
+    """Convert float32 audio to int16 PCM, clipping out-of-range samples"""
+    return (np.clip(audio_data, -1.0, 1.0) * 32767).astype(np.int16)
+
+
+def load_wav(path, sample_rate=SAMPLE_RATE):
+    """Read a PCM WAV file as mono int16 samples at sample_rate"""
+    with wave.open(path, 'rb') as wav_file:
+        channels = wav_file.getnchannels()
+        sample_width = wav_file.getsampwidth()
+        file_rate = wav_file.getframerate()
+        frames = wav_file.readframes(wav_file.getnframes())
+
+    audio = pcm_bytes_to_float32(frames, sample_width, channels)
+    return float32_to_pcm16(resample(audio, file_rate, sample_rate))
+
+
+def rms(audio_data):
+    """Root-mean-square energy of a float32 audio array"""
+    if len(audio_data) == 0:
+        return 0.0
+    return float(np.sqrt(np.mean(np.square(audio_data, dtype=np.float32))))
+
+
+class AudioRingBuffer:
+    """Fixed-capacity sample ring buffer backed by a preallocated NumPy array
+
+    Every sample is stored twice (at ``i`` and ``i + capacity``), so any run of
+    up to ``capacity`` samples can be handed out as a contiguous view without
+    copying. Views stay valid until the samples they cover are overwritten.
+    When a write would exceed the capacity the oldest samples are discarded
+    and counted in ``overflow_samples``.
+    """
+
+    def __init__(self, capacity, dtype=np.int16):
+        self.capacity = int(capacity)
+        if self.capacity <= 0:
+            raise ValueError("Ring buffer capacity must be positive")
+        self.dtype = np.dtype(dtype)
+        self._buffer = np.zeros(2 * self.capacity, dtype=self.dtype)
+        # Absolute sample counters; positions in the array are taken modulo capacity
+        self._read_pos = 0
+        self._write_pos = 0
+        self.overflow_samples = 0
+
+    def __len__(self):
+        return self._write_pos - self._read_pos
+
+    @property
+    def free(self):
+        """Number of samples that can be written without overwriting unread data"""
+        return self.capacity - len(self)
+
+    def write(self, samples):
+        """Append samples, discarding the oldest unread samples on overflow"""
+        samples = np.asarray(samples)
+        n = len(samples)
+        if n == 0:
+            return
+        if n > self.capacity:
+            # Only the newest ``capacity`` samples can survive the write
+            skipped = n - self.capacity
+            samples = samples[skipped:]
+            self._write_pos += skipped
+            n = self.capacity
+
+        cap = self.capacity
+        start = self._write_pos % cap
+        first = min(n, cap - start)
+        self._buffer[start:start + first] = samples[:first]
+        self._buffer[start + cap:start + cap + first] = samples[:first]
+        rest = n - first
+        if rest:
+            self._buffer[:rest] = samples[first:]
+            self._buffer[cap:cap + rest] = samples[first:]
+        self._write_pos += n
+
+        overflow = len(self) - cap
+        if overflow > 0:
+            self._read_pos += overflow
+            self.overflow_samples += overflow
+
+    def peek(self, count=None, offset=0):
+        """Return a zero-copy view of ``count`` unread samples starting at ``offset``"""
+        available = len(self) - offset
+        if count is None:
+            count = available
+        if offset < 0 or count < 0 or count > available:
+            raise ValueError(f"Cannot peek {count} samples at offset {offset} ({len(self)} buffered)")
+        start = (self._read_pos + offset) % self.capacity
+        return self._buffer[start:start + count]
+
+    def read(self, count):
+        """Return a zero-copy view of the next ``count`` samples and consume them"""
+        view = self.peek(count)
+        self._read_pos += count
+        return view
+
+    def skip(self, count):
+        """Discard up to ``count`` unread samples"""
+        count = min(count, len(self))
+        self._read_pos += count
+        return count
+
+    def clear(self):
+        """Discard all unread samples"""
+        self._read_pos = self._write_pos
+
+    def frame_rms(self, frame_size, count=None, offset=0):
+        """Vectorized RMS of consecutive ``frame_size`` windows over unread samples
+
+        Integer buffers are normalised to [-1.0, 1.0) so the result is directly
+        comparable with ``SILENCE_THRESHOLD``. A trailing partial frame is ignored.
+        """
+        if count is None:
+            count = len(self) - offset
+        n_frames = count // frame_size
+        if n_frames == 0:
+            return np.zeros(0, dtype=np.float32)
+        frames = self.peek(n_frames * frame_size, offset).reshape(n_frames, frame_size)
+        frames = frames.astype(np.float32)
+        if self.dtype.kind == 'i':
+            frames *= 1.0 / (np.iinfo(self.dtype).max + 1)
+        return np.sqrt(np.mean(np.square(frames), axis=1))
+
+
+class SpeechSegmenter:
+    """Energy-based endpointer that turns a stream of frames into utterances
+
+    Frames above ``threshold`` open an utterance, which also keeps ``pre_roll``
+    seconds of audio from before the onset. The utterance is closed once
+    ``hangover`` seconds of continuous silence follow the speech, or when it
+    reaches ``max_utterance`` seconds. Utterances with less than
+    ``min_speech`` seconds of voiced frames are discarded.
+    """
+
+    def __init__(self, sample_rate=SAMPLE_RATE, frame_duration=VAD_FRAME_DURATION,
+                 threshold=SILENCE_THRESHOLD, pre_roll=VAD_PRE_ROLL, hangover=VAD_HANGOVER,
+                 min_speech=MIN_SPEECH_DURATION, max_utterance=MAX_UTTERANCE_DURATION):
+        self.sample_rate = sample_rate
+        self.frame_size = max(int(sample_rate * frame_duration), 1)
+        self.threshold = threshold
+        self.pre_roll_samples = int(sample_rate * pre_roll)
+        self.hangover_samples = max(int(sample_rate * hangover), self.frame_size)
+        self.min_speech_samples = int(sample_rate * min_speech)
+        self.max_utterance_samples = max(int(sample_rate * max_utterance), self.frame_size)
+
+        self._pre_roll = AudioRingBuffer(max(self.pre_roll_samples, 1), dtype=np.float32)
+        self._utterance = np.zeros(
+            self.max_utterance_samples + self.pre_roll_samples + self.frame_size, dtype=np.float32
+        )
+        self._length = 0
+        self._in_speech = False
+        self._speech_samples = 0
+        self._silence_samples = 0
+        self.skipped_utterances = 0
+        # Offsets into the last processed audio at which each returned utterance's
+        # speech ended and at which its audio (including trailing silence) was cut
+        self.end_offsets = []
+        self.cut_offsets = []
+
+    def process(self, audio, levels=None):
+        """Feed whole frames of float32 audio and return any completed utterances
+
+        ``audio`` must hold a whole number of frames; ``levels`` optionally
+        carries their precomputed RMS values. ``end_offsets`` is updated with
+        the sample offset in ``audio`` where each utterance's speech ended,
+        and ``cut_offsets`` with the offset where its audio ends.
+        """
+        n_frames = len(audio) // self.frame_size
+        if levels is None:
+            frames = audio[:n_frames * self.frame_size].reshape(n_frames, self.frame_size)
+            levels = np.sqrt(np.mean(np.square(frames), axis=1))
+        voiced = np.asarray(levels) > self.threshold
+
+        utterances = []
+        self.end_offsets = []
+        self.cut_offsets = []
+        for i in range(n_frames):
+            frame = audio[i * self.frame_size:(i + 1) * self.frame_size]
+            if not self._in_speech:
+                if voiced[i]:
+                    self._start_utterance()
+                else:
+                    if self.pre_roll_samples:
+                        self._pre_roll.write(frame)
+                    continue
+
+            self._append(frame)
+            if voiced[i]:
+                self._speech_samples += self.frame_size
+                self._silence_samples = 0
+            else:
+                self._silence_samples += self.frame_size
+
+            if self._silence_samples >= self.hangover_samples:
+                end_offset = (i + 1) * self.frame_size - self._silence_samples
+                utterance = self._finish_utterance()
+                if utterance is not None:
+                    utterances.append(utterance)
+                    self.end_offsets.append(end_offset)
+                    self.cut_offsets.append((i + 1) * self.frame_size)
+            elif self._length >= self.max_utterance_samples:
+                # Cut overlong speech but keep listening for its continuation
+                end_offset = (i + 1) * self.frame_size - self._silence_samples
+                utterance = self._finish_utterance()
+                if utterance is not None:
+                    utterances.append(utterance)
+                    self.end_offsets.append(end_offset)
+                    self.cut_offsets.append((i + 1) * self.frame_size)
+                self._in_speech = True
+
+        return utterances
+
+    def current(self):
+        """View of the utterance in progress once it holds enough speech, else None"""
+        if not self._in_speech or self._speech_samples < self.min_speech_samples:
+            return None
+        return self._utterance[:self._length]
+
+    def flush(self):
+        """Close any open utterance, e.g. when the audio source ends"""
+        if not self._in_speech:
+            return None
+        return self._finish_utterance()
+
+    def reset(self):
+        """Drop all buffered audio"""
+        self._pre_roll.clear()
+        self._length = 0
+        self._in_speech = False
+        self._speech_samples = 0
+        self._silence_samples = 0
+
+    def _start_utterance(self):
+        pre_roll = self._pre_roll.peek()
+        self._utterance[:len(pre_roll)] = pre_roll
+        self._length = len(pre_roll)
+        self._pre_roll.clear()
+        self._in_speech = True
+        self._speech_samples = 0
+        self._silence_samples = 0
+
+    def _append(self, frame):
+        self._utterance[self._length:self._length + len(frame)] = frame
+        self._length += len(frame)
+
+    def _finish_utterance(self):
+        utterance = None
+        if self._speech_samples >= self.min_speech_samples:
+            utterance = self._utterance[:self._length].copy()
+        else:
+            self.skipped_utterances += 1
+        self._length = 0
+        self._in_speech = False
+        self._speech_samples = 0
+        self._silence_samples = 0
+        return utterance
+
+
+class AudioChunk:
+    """Captured audio on its way to the STT stage, with its utterance trace
+
+    ``start`` is the position of the first sample in the input, in seconds.
+    """
+
+    def __init__(self, audio, trace=None, start=None):
+        self.audio = audio
+        self.trace = trace
+        self.start = start
+
+
+class StreamingChunk:
+    """Snapshot of an utterance for streaming transcription
+
+    Partial snapshots hold all audio of the utterance recorded so far; the
+    final snapshot holds the complete utterance and its trace.
+    """
+
+    def __init__(self, utterance_id, audio, final, trace=None):
+        self.utterance_id = utterance_id
+        self.audio = audio
+        self.final = final
+        self.trace = trace
 
 
 class AudioRecorder:
     """Records audio from microphone in chunks"""
     
-    def __init__(self, sample_rate=SAMPLE_RATE, chunk_duration=CHUNK_DURATION, device_index=None):
+    # Samples read from PyAudio per call
+    FRAMES_PER_BUFFER = 1024
+
+    def __init__(self, sample_rate=SAMPLE_RATE, chunk_duration=CHUNK_DURATION, device_index=None,
+                 segmentation_mode=SEGMENTATION_MODE, queue_size=AUDIO_QUEUE_SIZE,
+                 overflow=AUDIO_QUEUE_OVERFLOW, streaming=STT_STREAMING,
+                 streaming_step=STREAMING_STEP):
         self.sample_rate = sample_rate
         self.chunk_duration = chunk_duration
         self.chunk_size = int(sample_rate * chunk_duration)
-        self.audio_queue = queue.Queue()
+        self.audio_queue = StageQueue("audio", queue_size, overflow, merge=merge_audio_chunks)
         self.running = False
         self.device_index = device_index
+        self.segmentation_mode = segmentation_mode
+        self.segmenter = SpeechSegmenter(sample_rate=sample_rate) if segmentation_mode == "vad" else None
+        self.skipped_chunks = 0
+        # Streaming mode publishes growing snapshots of the utterance in progress
+        self.streaming = streaming and self.segmenter is not None
+        if streaming and self.segmenter is None:
+            logger.warning("Streaming transcription requires SEGMENTATION_MODE=vad, disabling it")
+        self.streaming_step_samples = max(int(sample_rate * streaming_step), 1)
+        self._stream_utterance_id = 0
+        self._stream_snapshot_length = 0
+        # When the newest sample in the ring buffer was captured
+        self._last_read_time = None
+        # Samples fed in so far, i.e. the input position of the newest buffered sample
+        self.samples_fed = 0
+        # Set once the input has ended and every chunk has been queued (file sources only)
+        self.finished = False
+        # PortAudio input overflows: captured audio lost before it was read
+        self.input_overflows = 0
+        # Capture buffer, sized so a slow consumer can fall a few chunks behind
+        self.ring_buffer = AudioRingBuffer(
+            max(self.chunk_size, self.FRAMES_PER_BUFFER) * 4, dtype=np.int16
+        )
 
     def start(self):
         """Start recording audio"""
@@ -309,30 +1542,28 @@ class AudioRecorder:
                 channels=1,
                 rate=self.sample_rate,
                 input=True,
-                frames_per_buffer=1024,
+                frames_per_buffer=self.FRAMES_PER_BUFFER,
                 input_device_index=self.device_index
             )
             
             logger.info(f"Listening on microphone at {self.sample_rate}Hz (device {self.device_index})...")
-            audio_buffer = []
+            self.ring_buffer.clear()
             
             while self.running:
-                # Read audio data
-                data = stream.read(1024, exception_on_overflow=False)
-                audio_data = np.frombuffer(data, dtype=np.int16)
-                audio_buffer.extend(audio_data)
-                
-                # Check if we have enough audio
-                if len(audio_buffer) >= self.chunk_size:
-                    chunk = np.array(audio_buffer[:self.chunk_size])
-                    audio_buffer = audio_buffer[self.chunk_size:]
-                    
-                    # Check if chunk has speech (simple energy-based detection)
-                    audio_float = chunk.astype(np.float32) / 32768.0
-                    energy = np.sqrt(np.mean(audio_float ** 2))
-                    
-                    if energy > SILENCE_THRESHOLD:
-                        self.audio_queue.put(audio_float)
+                # Read audio data straight into the ring buffer
+                try:
+                    data = stream.read(self.FRAMES_PER_BUFFER, exception_on_overflow=True)
+                except IOError as e:
+                    if e.errno != pyaudio.paInputOverflowed:
+                        raise
+                    # The device dropped input because we read too late (e.g. a blocked enqueue)
+                    self.input_overflows += 1
+                    continue
+                for utterance in self.feed(np.frombuffer(data, dtype=np.int16)):
+                    self._enqueue(utterance)
+
+            for utterance in self.flush():
+                self._enqueue(utterance)
                         
         except Exception as e:
             logger.error(f"Error recording audio: {e}")
@@ -341,14 +1572,334 @@ class AudioRecorder:
             stream.close()
             p.terminate()
             
+    def feed(self, samples):
+        """Buffer captured int16 samples and return the chunks cut from them
+
+        This is the chunking and silence gating applied to microphone input,
+        so other audio sources can go through exactly the same path.
+        """
+        self._last_read_time = time.monotonic()
+        self.ring_buffer.write(samples)
+        self.samples_fed += len(samples)
+        return self._drain_ring_buffer()
+
+    def flush(self):
+        """Return the utterance still open at the end of the input, if any"""
+        if self.segmenter is None:
+            return []
+        utterance = self.segmenter.flush()
+        if utterance is None:
+            return []
+        trace = UtteranceTrace(capture_end=self._last_read_time)
+        trace.mark("gate")
+        if self.streaming:
+            return [self._streaming_final(utterance, trace)]
+        end = self.samples_fed - len(self.ring_buffer)
+        return [AudioChunk(utterance, trace, (end - len(utterance)) / self.sample_rate)]
+
+    def _enqueue(self, audio_chunk):
+        """Hand a chunk to the STT stage, waiting for room while recording"""
+        while not self.audio_queue.put(audio_chunk, timeout=0.1):
+            if not self.running:
+                logger.warning("Dropping audio chunk, recorder stopped while the audio queue was full")
+                self.audio_queue.dropped += 1
+                return
+
+    def _capture_time(self, samples_after):
+        """When the sample ``samples_after`` samples before the newest buffered one was captured"""
+        now = time.monotonic()
+        last_read = self._last_read_time if self._last_read_time is not None else now
+        return last_read - (samples_after + len(self.ring_buffer)) / self.sample_rate
+
+    def _drain_ring_buffer(self):
+        """Cut all complete utterances (or fixed chunks) out of the ring buffer"""
+        if self.segmenter is not None:
+            frame_size = self.segmenter.frame_size
+            count = (len(self.ring_buffer) // frame_size) * frame_size
+            if count == 0:
+                return []
+            block_start = self.samples_fed - len(self.ring_buffer)
+            levels = self.ring_buffer.frame_rms(frame_size, count)
+            skipped = self.segmenter.skipped_utterances
+            utterances = self.segmenter.process(
+                pcm16_to_float32(self.ring_buffer.read(count)), levels
+            )
+            self.skipped_chunks += self.segmenter.skipped_utterances - skipped
+            traces = []
+            for end_offset in self.segmenter.end_offsets:
+                trace = UtteranceTrace(capture_end=self._capture_time(count - end_offset))
+                trace.mark("gate")
+                traces.append(trace)
+            if self.streaming:
+                return self._streaming_chunks(utterances, traces)
+            return [
+                AudioChunk(utterance, trace, (block_start + cut_offset - len(utterance)) / self.sample_rate)
+                for utterance, trace, cut_offset in zip(utterances, traces, self.segmenter.cut_offsets)
+            ]
+
+        chunks = []
+        while len(self.ring_buffer) >= self.chunk_size:
+            start = (self.samples_fed - len(self.ring_buffer)) / self.sample_rate
+            # Single copy out of the ring buffer, converted to float32
+            audio_float = pcm16_to_float32(self.ring_buffer.read(self.chunk_size))
+
+            # Check if chunk has speech (simple energy-based detection)
+            if rms(audio_float) > SILENCE_THRESHOLD:
+                trace = UtteranceTrace(capture_end=self._capture_time(0))
+                trace.mark("gate")
+                chunks.append(AudioChunk(audio_float, trace, start))
+            else:
+                self.skipped_chunks += 1
+        return chunks
+
+    def _streaming_final(self, utterance, trace=None):
+        """Wrap a completed utterance as the final snapshot of its stream"""
+        chunk = StreamingChunk(self._stream_utterance_id, utterance, final=True, trace=trace)
+        self._stream_utterance_id += 1
+        self._stream_snapshot_length = 0
+        return chunk
+
+    def _streaming_chunks(self, utterances, traces):
+        """Turn completed utterances and the utterance in progress into snapshots"""
+        chunks = [self._streaming_final(utterance, trace) for utterance, trace in zip(utterances, traces)]
+
+        current = self.segmenter.current()
+        if current is not None and len(current) - self._stream_snapshot_length >= self.streaming_step_samples:
+            self._stream_snapshot_length = len(current)
+            chunks.append(StreamingChunk(self._stream_utterance_id, current.copy(), final=False))
+        return chunks
+
     def get_audio_chunk(self, timeout=0.1):
-        """Get next audio chunk from queue"""
+        """Get next audio chunk from queue (timeout=0 polls without blocking)"""
         try:
+            if not timeout:
+                return self.audio_queue.get_nowait()
             return self.audio_queue.get(timeout=timeout)
         except queue.Empty:
             return None
 
 
+class AudioFileSource:
+    """Audio read from a WAV, FLAC or raw PCM file, or from stdin ("-")
+
+    ``blocks()`` yields mono int16 blocks at ``sample_rate``. Raw PCM is
+    little-endian int16 at ``raw_rate`` with ``raw_channels`` channels. The
+    format is taken from the file extension, or sniffed from the header for
+    stdin. FLAC needs the optional soundfile package.
+    """
+
+    FORMATS = ("wav", "flac", "raw")
+
+    def __init__(self, path, fmt=None, sample_rate=SAMPLE_RATE, raw_rate=SAMPLE_RATE, raw_channels=1):
+        if fmt is not None and fmt not in self.FORMATS:
+            raise ValueError(f"Unknown audio format: {fmt}")
+        self.path = path
+        self.fmt = fmt
+        self.sample_rate = sample_rate
+        self.raw_rate = raw_rate
+        self.raw_channels = raw_channels
+
+    def _open(self):
+        """Open the input, returning (binary stream, format)"""
+        if self.path == "-":
+            stream = sys.stdin.buffer
+            fmt = self.fmt
+            if fmt is None:
+                header = stream.peek(4)[:4]
+                fmt = "wav" if header == b"RIFF" else "flac" if header == b"fLaC" else "raw"
+            return stream, fmt
+
+        fmt = self.fmt
+        if fmt is None:
+            extension = os.path.splitext(self.path)[1].lower()
+            fmt = {".wav": "wav", ".flac": "flac"}.get(extension, "raw")
+        return open(self.path, 'rb'), fmt
+
+    def blocks(self, block_duration=10.0):
+        """Yield the audio as int16 blocks of roughly block_duration seconds
+
+        Each block is resampled on its own, so long inputs are never held in
+        memory at once.
+        """
+        stream, fmt = self._open()
+        try:
+            if fmt == "wav":
+                decoded = self._wav_blocks(stream, block_duration)
+            elif fmt == "flac":
+                decoded = self._flac_blocks(stream, block_duration)
+            else:
+                decoded = self._raw_blocks(stream, block_duration)
+            for audio, rate in decoded:
+                if len(audio):
+                    yield float32_to_pcm16(resample(audio, rate, self.sample_rate))
+        finally:
+            if stream is not sys.stdin.buffer:
+                stream.close()
+
+    def _wav_blocks(self, stream, block_duration):
+        with wave.open(stream, 'rb') as wav_file:
+            channels = wav_file.getnchannels()
+            sample_width = wav_file.getsampwidth()
+            rate = wav_file.getframerate()
+            frames_per_block = max(int(rate * block_duration), 1)
+            while True:
+                frames = wav_file.readframes(frames_per_block)
+                if not frames:
+                    break
+                yield pcm_bytes_to_float32(frames, sample_width, channels), rate
+
+    def _flac_blocks(self, stream, block_duration):
+        try:
+            # Import here to avoid requiring it if not used
+            import soundfile
+        except ImportError:
+            logger.error("Reading FLAC needs soundfile. Install with: pip install soundfile")
+            raise
+
+        with soundfile.SoundFile(stream) as flac_file:
+            rate = flac_file.samplerate
+            for block in flac_file.blocks(blocksize=max(int(rate * block_duration), 1), dtype='float32',
+                                          always_2d=True):
+                yield block.mean(axis=1), rate
+
+    def _raw_blocks(self, stream, block_duration):
+        frame_bytes = 2 * self.raw_channels
+        block_bytes = max(int(self.raw_rate * block_duration), 1) * frame_bytes
+        remainder = b""
+        while True:
+            data = stream.read(block_bytes)
+            if not data:
+                break
+            data = remainder + data
+            usable = len(data) - len(data) % frame_bytes
+            remainder = data[usable:]
+            yield pcm_bytes_to_float32(data[:usable], 2, self.raw_channels), self.raw_rate
+
+
+class FileAudioRecorder(AudioRecorder):
+    """AudioRecorder fed from an AudioFileSource instead of a microphone
+
+    With ``realtime`` the input is paced like a live capture; otherwise it
+    is read as fast as the pipeline accepts it.
+    """
+
+    def __init__(self, source, realtime=True, **kwargs):
+        super().__init__(sample_rate=source.sample_rate, **kwargs)
+        self.source = source
+        self.realtime = realtime
+
+    def chunks(self, should_stop=None):
+        """Yield every chunk cut from the source, ending early once should_stop() is true"""
+        started = time.monotonic()
+        for block in self.source.blocks():
+            for offset in range(0, len(block), self.FRAMES_PER_BUFFER):
+                if should_stop is not None and should_stop():
+                    return
+                if self.realtime:
+                    delay = started + self.samples_fed / self.sample_rate - time.monotonic()
+                    if delay > 0:
+                        time.sleep(delay)
+                yield from self.feed(block[offset:offset + self.FRAMES_PER_BUFFER])
+        yield from self.flush()
+
+    def _record_audio(self):
+        """Feed the source through the pipeline in place of the microphone"""
+        try:
+            for chunk in self.chunks(should_stop=lambda: not self.running):
+                self._enqueue(chunk)
+            logger.info(f"Finished reading audio from {self.source.path}")
+        except Exception as e:
+            logger.error(f"Error reading audio from {self.source.path}: {e}")
+        finally:
+            self.finished = True
+
+
+class OpenAIWhisperEngine:
+    """Reference STT engine using openai-whisper (PyTorch, fp32 on CPU)"""
+
+    name = "whisper"
+
+    def __init__(self, model_name=WHISPER_MODEL):
+        self.model = whisper.load_model(model_name)
+
+    def transcribe(self, audio_data):
+        """Return a Whisper-style result dict with text and segments"""
+        # Whisper expects audio in float32 format
+        return self.model.transcribe(
+            audio_data,
+            language="en",
+            fp16=False
+        )
+
+    def transcribe_batch(self, audio_batch):
+        """Decode several chunks as one batched tensor, returning results in order
+
+        Batched decoding runs a single encoder and decoder pass over up to 30 s
+        of audio per chunk, without transcribe()'s temperature fallback. Longer
+        chunks are transcribed one by one.
+        """
+        if len(audio_batch) == 1 or any(len(audio) > whisper.audio.N_SAMPLES for audio in audio_batch):
+            return [self.transcribe(audio) for audio in audio_batch]
+
+        import torch
+
+        mel = torch.stack([
+            whisper.log_mel_spectrogram(whisper.pad_or_trim(audio), n_mels=self.model.dims.n_mels)
+            for audio in audio_batch
+        ]).to(self.model.device)
+        options = whisper.DecodingOptions(language="en", fp16=False, without_timestamps=True)
+        results = whisper.decode(self.model, mel, options)
+        return [
+            {"text": result.text, "segments": [{"no_speech_prob": result.no_speech_prob}]}
+            for result in results
+        ]
+
+
+class FasterWhisperEngine:
+    """Optimized STT engine using faster-whisper (CTranslate2, int8 on CPU by default)"""
+
+    name = "faster-whisper"
+
+    def __init__(self, model_name=WHISPER_MODEL, device=STT_DEVICE,
+                 compute_type=STT_COMPUTE_TYPE, cpu_threads=STT_CPU_THREADS):
+        try:
+            # Import here to avoid requiring it if not used
+            from faster_whisper import WhisperModel
+        except ImportError:
+            logger.error("Failed to import faster-whisper. Install with: pip install -r requirements-faster-whisper.txt")
+            raise
+
+        self.model = WhisperModel(
+            model_name,
+            device=device,
+            compute_type=compute_type,
+            cpu_threads=cpu_threads
+        )
+
+    def transcribe(self, audio_data):
+        """Return a Whisper-style result dict with text and segments"""
+        segments, _ = self.model.transcribe(audio_data, language="en")
+        # Segments are generated lazily, decoding happens while iterating
+        segments = list(segments)
+        return {
+            "text": "".join(segment.text for segment in segments),
+            "segments": [{"no_speech_prob": segment.no_speech_prob} for segment in segments]
+        }
+
+    def transcribe_batch(self, audio_batch):
+        """Transcribe several chunks in order (CTranslate2 decodes them sequentially)"""
+        return [self.transcribe(audio) for audio in audio_batch]
+
+
+def create_stt_engine(engine_name=STT_ENGINE, model_name=WHISPER_MODEL, cpu_threads=STT_CPU_THREADS):
+    """Factory function to create the configured STT engine"""
+    if engine_name in ("faster-whisper", "faster_whisper", "ctranslate2"):
+        return FasterWhisperEngine(model_name, cpu_threads=cpu_threads)
+    if engine_name != "whisper":
+        logger.warning(f"Unknown STT engine '{engine_name}', falling back to openai-whisper")
+    return OpenAIWhisperEngine(model_name)
+
+
 class WhisperTranscriber:
     """Transcribes audio using Whisper"""
 
@@ -358,102 +1909,802 @@ class WhisperTranscriber:
         "bye.", "bye", "goodbye", "you", ".", ""
     }
 
-    def __init__(self, model_name=WHISPER_MODEL):
-        logger.info(f"Loading Whisper model '{model_name}'...")
-        self.model = whisper.load_model(model_name)
+    def __init__(self, model_name=WHISPER_MODEL, engine=STT_ENGINE, cpu_threads=STT_CPU_THREADS):
+        logger.info(f"Loading Whisper model '{model_name}' (engine: {engine})...")
+        self.engine = create_stt_engine(engine, model_name, cpu_threads)
         logger.info("Whisper model loaded successfully")
+        self.rtf = RealTimeFactor()
+        # Whisper models are not thread-safe, so all decoding goes through one worker
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="whisper")
+
+    async def transcribe_async(self, audio_data):
+        """Transcribe audio data on the Whisper worker thread without blocking the event loop"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self.transcribe, audio_data)
+
+    async def transcribe_batch_async(self, audio_batch):
+        """Transcribe several chunks on the Whisper worker thread, returning texts in order"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self.transcribe_batch, audio_batch)
+
+    def close(self):
+        """Stop the Whisper worker thread"""
+        self._executor.shutdown(wait=False)
 
     def transcribe(self, audio_data):
-        """Transcribe audio data"""
+        """Transcribe audio data, filtering hallucinations and likely silence"""
+        started = time.perf_counter()
         try:
-            # Whisper expects audio in float32 format
-            result = self.model.transcribe(
-                audio_data,
-                language="en",
-                fp16=False
-            )
-            text = result["text"].strip()
+            result = self.engine.transcribe(audio_data)
+        except Exception as e:
+            logger.error(f"Error transcribing audio: {e}")
+            return None
+        self.rtf.add(time.perf_counter() - started, len(audio_data) / SAMPLE_RATE)
+        return self._filter_result(result)
 
-            # Filter out empty transcriptions
-            if not text:
-                return None
+    def transcribe_batch(self, audio_batch):
+        """Transcribe several chunks in one batched decode, returning texts in order"""
+        started = time.perf_counter()
+        try:
+            results = self.engine.transcribe_batch(audio_batch)
+        except Exception as e:
+            logger.warning(f"Batched transcription failed, transcribing chunks one by one: {e}")
+            return [self.transcribe(audio) for audio in audio_batch]
+        self.rtf.add(time.perf_counter() - started, sum(len(audio) for audio in audio_batch) / SAMPLE_RATE)
+        return [self._filter_result(result) for result in results]
 
-            # Filter out common hallucinations
-            if text.lower() in self.HALLUCINATION_PHRASES:
-                logger.debug(f"Filtered hallucination: '{text}'")
-                return None
+    def _filter_result(self, result):
+        """Extract text from an engine result, or None for silence and hallucinations"""
+        text = result["text"].strip()
 
-            # Check no_speech_prob to detect silence
-            # Higher values (>0.6) indicate likely silence/hallucination
-            avg_no_speech_prob = sum(
-                segment.get("no_speech_prob", 0)
-                for segment in result.get("segments", [])
-            ) / max(len(result.get("segments", [])), 1)
+        # Filter out empty transcriptions
+        if not text:
+            return None
 
-            if avg_no_speech_prob > 0.6:
-                logger.debug(f"Filtered low-confidence transcription (no_speech_prob={avg_no_speech_prob:.2f}): '{text}'")
-                return None
+        # Filter out common hallucinations
+        if text.lower() in self.HALLUCINATION_PHRASES:
+            logger.debug(f"Filtered hallucination: '{text}'")
+            return None
 
-            return text
+        # Check no_speech_prob to detect silence
+        # Higher values (>0.6) indicate likely silence/hallucination
+        avg_no_speech_prob = sum(
+            segment.get("no_speech_prob", 0)
+            for segment in result.get("segments", [])
+        ) / max(len(result.get("segments", [])), 1)
 
-        except Exception as e:
-            logger.error(f"Error transcribing audio: {e}")
+        if avg_no_speech_prob > 0.6:
+            logger.debug(f"Filtered low-confidence transcription (no_speech_prob={avg_no_speech_prob:.2f}): '{text}'")
+            return None
+
+        return text
+
+
+class TranscriptEvent:
+    """Text produced by the streaming transcriber
+
+    Final events carry newly committed words that will not change any more;
+    partial events carry the current uncommitted tail of the hypothesis.
+    """
+
+    def __init__(self, text, is_final, utterance_id):
+        self.text = text
+        self.is_final = is_final
+        self.utterance_id = utterance_id
+
+
+class StreamingTranscriber:
+    """Incremental transcription of growing utterance snapshots
+
+    Every snapshot of the utterance in progress is decoded from its start.
+    Words on which two consecutive hypotheses agree are committed and emitted
+    as a final event; the rest is emitted as a partial event. The final
+    snapshot of an utterance commits whatever is left. The decoding window is
+    bounded by MAX_UTTERANCE_DURATION, where the segmenter cuts utterances.
+    """
+
+    def __init__(self, transcriber):
+        self.transcriber = transcriber
+        self._utterance_id = None
+        self._previous_words = []
+        self._committed_words = []
+
+    def process(self, chunk):
+        """Decode a StreamingChunk and return the resulting TranscriptEvents"""
+        return self._update(chunk, self.transcriber.transcribe(chunk.audio))
+
+    async def process_async(self, chunk):
+        """Decode a StreamingChunk on the Whisper worker thread"""
+        return self._update(chunk, await self.transcriber.transcribe_async(chunk.audio))
+
+    @staticmethod
+    def _normalize(word):
+        return word.strip(".,!?;:\"'").lower()
+
+    def _update(self, chunk, text):
+        if chunk.utterance_id != self._utterance_id:
+            self._reset(chunk.utterance_id)
+
+        words = text.split() if text else []
+        committed = len(self._committed_words)
+        events = []
+
+        if chunk.final:
+            tail = words[committed:]
+            if tail:
+                events.append(TranscriptEvent(" ".join(tail), True, chunk.utterance_id))
+            self._reset(None)
+            return events
+
+        # Commit the prefix on which this and the previous hypothesis agree
+        agreed = 0
+        for previous, current in zip(self._previous_words, words):
+            if self._normalize(previous) != self._normalize(current):
+                break
+            agreed += 1
+        if agreed > committed:
+            new_words = words[committed:agreed]
+            self._committed_words.extend(new_words)
+            events.append(TranscriptEvent(" ".join(new_words), True, chunk.utterance_id))
+        self._previous_words = words
+
+        pending = words[len(self._committed_words):]
+        if pending:
+            events.append(TranscriptEvent(" ".join(pending), False, chunk.utterance_id))
+        return events
+
+    def _reset(self, utterance_id):
+        self._utterance_id = utterance_id
+        self._previous_words = []
+        self._committed_words = []
+
+
+class LatencyHistogram:
+    """Latency distribution in exponentially sized buckets
+
+    Bucket upper bounds double from ``min_bound`` seconds; percentiles are
+    interpolated linearly within the bucket they fall in and capped at the
+    largest observation.
+    """
+
+    def __init__(self, min_bound=0.001, buckets=17):
+        self.bounds = [min_bound * 2 ** i for i in range(buckets)]
+        self.counts = [0] * (buckets + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds):
+        index = 0
+        while index < len(self.bounds) and seconds > self.bounds[index]:
+            index += 1
+        self.counts[index] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def percentile(self, q):
+        """Estimate the q-th percentile (0-100) in seconds"""
+        if not self.count:
             return None
+        rank = q / 100 * self.count
+        seen = 0
+        lower = 0.0
+        for bound, count in zip(self.bounds, self.counts):
+            if count and seen + count >= rank:
+                return min(lower + (bound - lower) * (rank - seen) / count, self.max)
+            seen += count
+            lower = bound
+        return self.max
+
+    def stats(self):
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else None,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+            "max": self.max,
+        }
 
 
 class SpeakerbotClient:
-    """WebSocket client for Speakerbot"""
+    """WebSocket client for Speakerbot
+
+    A background task owns the connection: it reconnects with jittered
+    exponential backoff and relies on websocket pings to notice a dead peer.
+    ``send_transcription`` only queues the request, and a sender task flushes
+    the queue whenever the connection is up, so transcriptions made during a
+    short outage are spoken once Speakerbot is reachable again.
+
+    Requests carry increasing IDs. Responses are matched to them by ID to
+    measure send-to-ack latency per request type, and at most
+    ``max_in_flight`` requests are left unacknowledged at a time.
+    """
     
-    def __init__(self, url=WEBSOCKET_URL):
+    def __init__(self, url=WEBSOCKET_URL, send_queue_size=SPEAKERBOT_SEND_QUEUE_SIZE,
+                 ping_interval=SPEAKERBOT_PING_INTERVAL, ping_timeout=SPEAKERBOT_PING_TIMEOUT,
+                 reconnect_min=SPEAKERBOT_RECONNECT_MIN, reconnect_max=SPEAKERBOT_RECONNECT_MAX,
+                 max_in_flight=SPEAKERBOT_MAX_IN_FLIGHT, ack_timeout=SPEAKERBOT_ACK_TIMEOUT,
+                 send_ttl=SPEAKERBOT_SEND_TTL):
         self.url = url
         self.websocket = None
         self.connected = False
-        
+        self.ping_interval = ping_interval if ping_interval > 0 else None
+        self.ping_timeout = ping_timeout if ping_timeout > 0 else None
+        self.reconnect_min = reconnect_min
+        self.reconnect_max = max(reconnect_max, reconnect_min)
+        self.outbound = StageQueue("speakerbot", send_queue_size, "drop_oldest", on_drop=self._on_dropped)
+        self.send_ttl = send_ttl
+        self.max_in_flight = max_in_flight
+        self.ack_timeout = ack_timeout
+        self.reconnects = 0
+        self.sent = 0
+        self.expired = 0
+        self.acked = 0
+        self.errors = 0
+        self.ack_timeouts = 0
+        self.unacknowledged = 0
+        self.ack_latency = {}
+        self._next_request_id = 1
+        self._in_flight = {}
+        self._ack_event = None
+        self._connected_event = None
+        self._tasks = []
+        self._closing = False
+
     async def connect(self):
-        """Connect to Speakerbot WebSocket"""
+        """Connect to Speakerbot WebSocket and start the connection manager"""
+        if self._tasks:
+            return
+        self._closing = False
+        self._connected_event = asyncio.Event()
+        self._ack_event = asyncio.Event()
+        await self._open()
+        self._tasks = [
+            asyncio.create_task(self._manage_connection()),
+            asyncio.create_task(self._send_queued()),
+        ]
+
+    async def _open(self):
+        """Try once to open the WebSocket, returning True on success"""
         try:
-            self.websocket = await websockets.connect(self.url)
-            self.connected = True
-            logger.info(f"Connected to Speakerbot at {self.url}")
+            self.websocket = await websockets.connect(
+                self.url, ping_interval=self.ping_interval, ping_timeout=self.ping_timeout
+            )
         except Exception as e:
             logger.error(f"Failed to connect to Speakerbot: {e}")
             self.connected = False
-            
-    async def send_transcription(self, text):
-        """Send transcription to Speakerbot"""
-        if not self.connected:
-            logger.warning("Not connected to Speakerbot, attempting to reconnect...")
-            await self.connect()
-            
-        if self.connected:
+            return False
+        self.connected = True
+        self._connected_event.set()
+        logger.info(f"Connected to Speakerbot at {self.url}")
+        return True
+
+    def _backoff_delay(self, attempt):
+        """Full-jitter exponential backoff for the given reconnect attempt"""
+        return random.uniform(0, min(self.reconnect_max, self.reconnect_min * 2 ** attempt))
+
+    async def _manage_connection(self):
+        """Keep the connection open, reconnecting with backoff whenever it drops"""
+        attempt = 0
+        while not self._closing:
+            if self.connected:
+                attempt = 0
+                try:
+                    # Reading also keeps pongs flowing for the keepalive
+                    async for message in self.websocket:
+                        self._handle_response(message)
+                except Exception as e:
+                    logger.warning(f"Speakerbot connection lost: {e}")
+                self.connected = False
+                self._connected_event.clear()
+                if self._in_flight:
+                    # Whether these were spoken is unknown; resending could repeat them
+                    logger.warning(f"{len(self._in_flight)} Speakerbot request(s) unacknowledged at disconnect")
+                    self.unacknowledged += len(self._in_flight)
+                    for _, _, trace in self._in_flight.values():
+                        if trace is not None:
+                            trace.finish()
+                    self._in_flight.clear()
+                    self._ack_event.set()
+                if self._closing:
+                    break
+                logger.warning("Disconnected from Speakerbot, reconnecting...")
+
+            await asyncio.sleep(self._backoff_delay(attempt))
+            attempt += 1
+            if not self._closing and await self._open():
+                self.reconnects += 1
+
+    def _handle_response(self, message):
+        """Match a Speakerbot response to its request and record the round trip"""
+        try:
+            response = json.loads(message)
+            request_id = str(response.get("id"))
+        except (ValueError, AttributeError):
+            logger.debug(f"Speakerbot: {message}")
+            return
+
+        request = self._in_flight.pop(request_id, None)
+        if request is None:
+            logger.debug(f"Speakerbot response for unknown request {request_id}: {message}")
+            return
+        request_type, sent_at, trace = request
+        latency = time.monotonic() - sent_at
+        self.ack_latency.setdefault(request_type, LatencyHistogram()).observe(latency)
+        self._ack_event.set()
+        if trace is not None:
+            trace.finish("tts_ack")
+
+        status = str(response.get("status", "ok")).lower()
+        if status in ("ok", "success"):
+            self.acked += 1
+            logger.debug(f"Speakerbot acknowledged ID {request_id} in {latency * 1000:.0f} ms")
+        else:
+            self.errors += 1
+            logger.warning(f"Speakerbot rejected ID {request_id}: {message}")
+
+    def _expire_in_flight(self):
+        """Stop waiting for responses older than the ack timeout"""
+        if self.ack_timeout <= 0:
+            return
+        cutoff = time.monotonic() - self.ack_timeout
+        for request_id, (_, sent_at, trace) in list(self._in_flight.items()):
+            if sent_at < cutoff:
+                del self._in_flight[request_id]
+                if trace is not None:
+                    trace.finish()
+                self.ack_timeouts += 1
+                self._ack_event.set()
+                logger.warning(f"No response from Speakerbot for ID {request_id} after {self.ack_timeout:.1f}s")
+
+    async def _wait_for_window(self):
+        """Wait until fewer than max_in_flight requests are unacknowledged"""
+        while self.max_in_flight > 0 and not self._closing:
+            self._expire_in_flight()
+            if len(self._in_flight) < self.max_in_flight:
+                return
+            self._ack_event.clear()
+            try:
+                await asyncio.wait_for(self._ack_event.wait(), timeout=0.1)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _send_queued(self):
+        """Send queued transcriptions in order while the connection is up"""
+        pending = None
+        while not self._closing:
+            if pending is None:
+                pending = await self.outbound.get_async(timeout=0.1)
+                if pending is None:
+                    # Responses can time out while nothing is being sent
+                    self._expire_in_flight()
+                    continue
+            request_id, text, message, expires, trace = pending
+            if expires is not None and time.monotonic() > expires:
+                # Held through an outage for too long to still be relevant
+                self.expired += 1
+                logger.warning(f"Dropped stale transcription (ID {request_id}): {text}")
+                if trace is not None:
+                    trace.finish()
+                pending = None
+                continue
+
+            if not self.connected:
+                try:
+                    await asyncio.wait_for(self._connected_event.wait(), timeout=0.1)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            await self._wait_for_window()
+            if not self.connected:
+                continue
+
             try:
-                id = random.randrange(10000, 99999)
-                message = json.dumps({
-                    "request": "Speak",
-                    "id": f"{id}",
-                    "voice": f"{VOICE_NAME}",
-                    "message": f"{text}"
-                })
+                self._in_flight[str(request_id)] = ("Speak", time.monotonic(), trace)
                 await self.websocket.send(message)
-                logger.info(f"Sent (ID {id}): {text}")
             except Exception as e:
+                # Keep the message; it is retried once the manager reconnects
+                self._in_flight.pop(str(request_id), None)
                 logger.error(f"Error sending transcription: {e}")
                 self.connected = False
+                self._connected_event.clear()
+                continue
+            self.sent += 1
+            logger.info(f"Sent (ID {request_id}): {text}")
+            pending = None
+            
+    async def send_transcription(self, text, job=None):
+        """Queue transcription for Speakerbot without waiting for the network"""
+        if job is not None:
+            job.check()
+
+        if not self._tasks:
+            logger.warning("Speakerbot client not started, connecting...")
+            await self.connect()
+
+        id = self._next_request_id
+        self._next_request_id += 1
+        message = json.dumps({
+            "request": "Speak",
+            "id": f"{id}",
+            "voice": f"{VOICE_NAME}",
+            "message": f"{text}"
+        })
+        if not self.connected:
+            logger.info(f"Not connected to Speakerbot, queued (ID {id}): {text}")
+        expires = time.monotonic() + self.send_ttl if self.send_ttl > 0 else None
+        self.outbound.put((id, text, message, expires, job.trace if job is not None else None))
+
+    @staticmethod
+    def _on_dropped(request):
+        """Close the trace of a transcription pushed out of the full send queue"""
+        request_id, text, _, _, trace = request
+        logger.warning(f"Send queue full, dropped transcription (ID {request_id}): {text}")
+        if trace is not None:
+            trace.finish()
+
+    @property
+    def idle(self):
+        """True when no transcription is queued or awaiting a response"""
+        return self.outbound.empty() and not self._in_flight
+
+    @property
+    def drain_timeout(self):
+        """Longest a queued transcription can take to be sent and acknowledged"""
+        return (self.send_ttl or self.reconnect_max) + max(self.ack_timeout, 0)
+
+    def stats(self):
+        """Connection and send queue counters"""
+        return dict(
+            self.outbound.stats(),
+            connected=self.connected, sent=self.sent, expired=self.expired, reconnects=self.reconnects,
+            in_flight=len(self._in_flight), acked=self.acked, errors=self.errors,
+            ack_timeouts=self.ack_timeouts, unacknowledged=self.unacknowledged,
+            ack_latency={name: histogram.stats() for name, histogram in self.ack_latency.items()}
+        )
                 
     async def close(self):
         """Close WebSocket connection"""
+        self._closing = True
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
         if self.websocket:
             await self.websocket.close()
             self.connected = False
             logger.info("Disconnected from Speakerbot")
 
 
+_file_digests = {}
+
+
+def file_digest(path):
+    """SHA-256 of a file's contents, memoised on path, size and modification time"""
+    if not path or not os.path.exists(path):
+        return ""
+    stat = os.stat(path)
+    memo_key = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+    digest = _file_digests.get(memo_key)
+    if digest is None:
+        sha = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                sha.update(block)
+        digest = sha.hexdigest()
+        _file_digests[memo_key] = digest
+    return digest
+
+
+class TTSCache:
+    """Two-tier cache of synthesized speech
+
+    Audio is stored as int16 PCM, both in an in-memory LRU bounded by
+    ``memory_bytes`` and as content-addressed blobs in ``cache_dir`` bounded by
+    ``disk_bytes`` (least recently used blobs are evicted first). Each blob is
+    a little-endian uint32 sample rate followed by the samples.
+    """
+
+    BLOB_SUFFIX = ".pcm"
+
+    def __init__(self, memory_bytes=TTS_CACHE_MEMORY_MB * 1024 * 1024, cache_dir=TTS_CACHE_DIR,
+                 disk_bytes=TTS_CACHE_DISK_MB * 1024 * 1024):
+        self.memory_bytes = int(memory_bytes)
+        self.cache_dir = cache_dir if cache_dir and disk_bytes > 0 else None
+        self.disk_bytes = int(disk_bytes)
+        self._memory = OrderedDict()
+        self._memory_used = 0
+        self._disk_index = {}
+        self._disk_used = 0
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+        if self.cache_dir:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            for name in os.listdir(self.cache_dir):
+                if name.endswith(self.BLOB_SUFFIX):
+                    stat = os.stat(os.path.join(self.cache_dir, name))
+                    self._disk_index[name] = (stat.st_size, stat.st_mtime)
+                    self._disk_used += stat.st_size
+
+    @staticmethod
+    def make_key(engine, model, ref_audio=None, params=None, text=""):
+        """Content address for a synthesis request"""
+        normalized_text = " ".join(unicodedata.normalize("NFC", text).split())
+        payload = json.dumps(
+            [engine, model, file_digest(ref_audio), params or {}, normalized_text],
+            sort_keys=True
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        """Return cached (float32 audio, sample_rate) or None"""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return pcm16_to_float32(entry[0]), entry[1]
+
+        entry = self._read_blob(key)
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._remember(key, *entry)
+        return pcm16_to_float32(entry[0]), entry[1]
+
+    def put(self, key, audio_data, sample_rate):
+        """Store float32 audio for key in both tiers"""
+        pcm = (np.clip(audio_data, -1.0, 1.0) * 32767).astype(np.int16)
+        with self._lock:
+            self._remember(key, pcm, sample_rate)
+        self._write_blob(key, pcm, sample_rate)
+
+    def _remember(self, key, pcm, sample_rate):
+        if pcm.nbytes > self.memory_bytes:
+            return
+        previous = self._memory.pop(key, None)
+        if previous is not None:
+            self._memory_used -= previous[0].nbytes
+        self._memory[key] = (pcm, sample_rate)
+        self._memory_used += pcm.nbytes
+        while self._memory_used > self.memory_bytes:
+            _, (evicted, _) = self._memory.popitem(last=False)
+            self._memory_used -= evicted.nbytes
+
+    def _blob_path(self, key):
+        return os.path.join(self.cache_dir, key + self.BLOB_SUFFIX)
+
+    def _read_blob(self, key):
+        if not self.cache_dir:
+            return None
+        path = self._blob_path(key)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            # Touch the blob so eviction treats it as recently used
+            os.utime(path)
+        except OSError:
+            return None
+        with self._lock:
+            self._disk_index[key + self.BLOB_SUFFIX] = (len(data), time.time())
+        sample_rate = int(np.frombuffer(data[:4], dtype='<u4')[0])
+        return np.frombuffer(data[4:], dtype='<i2').copy(), sample_rate
+
+    def _write_blob(self, key, pcm, sample_rate):
+        if not self.cache_dir:
+            return
+        name = key + self.BLOB_SUFFIX
+        path = self._blob_path(key)
+        data = np.array([sample_rate], dtype='<u4').tobytes() + pcm.astype('<i2').tobytes()
+        try:
+            # Write to a temporary file first so readers never see partial blobs
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Failed to write TTS cache entry: {e}")
+            return
+
+        with self._lock:
+            previous = self._disk_index.get(name)
+            if previous is not None:
+                self._disk_used -= previous[0]
+            self._disk_index[name] = (len(data), time.time())
+            self._disk_used += len(data)
+            if self._disk_used <= self.disk_bytes:
+                return
+            # Evict least recently used blobs until the store fits its budget
+            for evicted, (size, _) in sorted(self._disk_index.items(), key=lambda item: item[1][1]):
+                if self._disk_used <= self.disk_bytes:
+                    break
+                try:
+                    os.remove(os.path.join(self.cache_dir, evicted))
+                except OSError:
+                    pass
+                del self._disk_index[evicted]
+                self._disk_used -= size
+
+
+def create_tts_cache():
+    """Create the shared TTS cache, or None if both tiers are disabled"""
+    if TTS_CACHE_MEMORY_MB <= 0 and not (TTS_CACHE_DIR and TTS_CACHE_DISK_MB > 0):
+        return None
+    try:
+        return TTSCache()
+    except OSError as e:
+        logger.warning(f"TTS cache disabled: {e}")
+        return None
+
+
+async def synthesize_cached(cache, cache_key, synthesize, text, job=None):
+    """Return (audio, sample_rate) for text from the cache or by running synthesize off the event loop"""
+    if job is not None:
+        job.check()
+
+    if cache is not None:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            logger.info(f"TTS cache hit for: {text}")
+            return cached
+
+    loop = asyncio.get_running_loop()
+    audio_data, sample_rate = await loop.run_in_executor(None, synthesize, text)
+    if cache is not None and audio_data is not None and len(audio_data):
+        cache.put(cache_key, audio_data, sample_rate)
+    return audio_data, sample_rate
+
+
+class ReferenceEncodingStore:
+    """Persists encodings of reference audio so each voice is encoded once
+
+    Encodings are stored as ``.npy`` files keyed by a hash of the reference
+    audio contents and ``namespace``, which identifies the encoder (e.g. the
+    codec repo and device).
+    """
+
+    def __init__(self, cache_dir, namespace):
+        self.cache_dir = cache_dir
+        self.namespace = namespace
+
+    def _path(self, ref_audio):
+        key = hashlib.sha256(
+            f"{file_digest(ref_audio)}|{self.namespace}".encode("utf-8")
+        ).hexdigest()
+        return os.path.join(self.cache_dir, f"{key}.npy")
+
+    def load(self, ref_audio):
+        """Return the stored encoding of ref_audio, or None"""
+        path = self._path(ref_audio)
+        if not os.path.exists(path):
+            return None
+        try:
+            encoding = np.load(path)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable reference encoding {path}: {e}")
+            return None
+        try:
+            import torch
+            return torch.from_numpy(encoding)
+        except ImportError:
+            return encoding
+
+    def save(self, ref_audio, encoding):
+        """Store the encoding of ref_audio"""
+        if hasattr(encoding, "cpu"):
+            encoding = encoding.detach().cpu().numpy()
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self._path(ref_audio)
+        tmp_path = f"{path}.{os.getpid()}.tmp.npy"
+        np.save(tmp_path, np.asarray(encoding))
+        os.replace(tmp_path, path)
+
+    def encode(self, ref_audio, encoder):
+        """Return the encoding of ref_audio, running encoder and storing the result on a miss"""
+        encoding = self.load(ref_audio)
+        if encoding is not None:
+            logger.info(f"Loaded encoded reference audio for {ref_audio}")
+            return encoding
+
+        logger.info(f"Encoding reference audio from {ref_audio}...")
+        encoding = encoder(ref_audio)
+        try:
+            self.save(ref_audio, encoding)
+        except OSError as e:
+            logger.warning(f"Failed to store encoded reference audio: {e}")
+        return encoding
+
+
+_SENTENCE_BOUNDARY = re.compile(r'(?:(?<=[.!?\u2026])|(?<=[.!?\u2026]["\')\]]))\s+')
+_CLAUSE_BOUNDARY = re.compile(r'(?<=[,;:\u2013\u2014])\s+')
+
+
+def split_text_segments(text, max_chars=TTS_MAX_SEGMENT_CHARS, min_chars=20):
+    """Split text into sentences, and overlong sentences into clauses
+
+    Segments shorter than ``min_chars`` are joined to the following one so
+    the TTS engines are not asked to speak single words out of context.
+    """
+    pieces = []
+    for sentence in _SENTENCE_BOUNDARY.split(text.strip()):
+        if len(sentence) <= max_chars:
+            pieces.append(sentence)
+            continue
+        clause = ""
+        for part in _CLAUSE_BOUNDARY.split(sentence):
+            if clause and len(clause) + len(part) + 1 > max_chars:
+                pieces.append(clause)
+                clause = part
+            else:
+                clause = f"{clause} {part}" if clause else part
+        if clause:
+            pieces.append(clause)
+
+    segments = []
+    pending = ""
+    for piece in pieces:
+        piece = piece.strip()
+        if not piece:
+            continue
+        pending = f"{pending} {piece}" if pending else piece
+        if len(pending) >= min_chars:
+            segments.append(pending)
+            pending = ""
+    if pending:
+        if segments:
+            segments[-1] = f"{segments[-1]} {pending}"
+        else:
+            segments.append(pending)
+    return segments
+
+
+async def synthesize_segmented(text, cache, cache_key, synthesize, audio_player, job=None):
+    """Synthesize text segment by segment with gapless playback
+
+    Each segment is queued as a non-final clip as soon as it is synthesized,
+    so it plays while the next one is being synthesized. ``cache_key`` maps a
+    segment to its TTS cache key. A cancelled, expired or superseded ``job``
+    stops synthesis before the next segment. Returns the number of segments played.
+    """
+    played = 0
+    sample_rate = None
+    deadline = job.deadline if job is not None else None
+    try:
+        for segment in split_text_segments(text):
+            audio_data, segment_rate = await synthesize_cached(
+                cache, cache_key(segment), synthesize, segment, job
+            )
+            if audio_data is None or not len(audio_data):
+                continue
+            if sample_rate is not None and segment_rate != sample_rate:
+                # Close the utterance on the player before switching rates
+                await audio_player.play_async(np.zeros(0, dtype=np.float32), sample_rate=sample_rate)
+            sample_rate = segment_rate
+            await audio_player.play_async(
+                audio_data, sample_rate=sample_rate, final=False, deadline=None if played else deadline
+            )
+            played += 1
+    finally:
+        if sample_rate is not None:
+            # Empty final clip closes the utterance on the player
+            await audio_player.play_async(np.zeros(0, dtype=np.float32), sample_rate=sample_rate)
+    return played
+
+
 class NeuTTSClient:
     """Local NeuTTS Air TTS client"""
     
     def __init__(self, backbone=NEUTTS_BACKBONE, backbone_device=NEUTTS_BACKBONE_DEVICE,
                  codec=NEUTTS_CODEC, codec_device=NEUTTS_CODEC_DEVICE,
-                 ref_audio=NEUTTS_REF_AUDIO, ref_text=NEUTTS_REF_TEXT, audio_player=None):
+                 ref_audio=NEUTTS_REF_AUDIO, ref_text=NEUTTS_REF_TEXT, audio_player=None, cache=None,
+                 sentence_split=TTS_SENTENCE_SPLIT, streaming=NEUTTS_STREAMING):
         self.backbone = backbone
         self.backbone_device = backbone_device
         self.codec = codec
@@ -464,14 +2715,42 @@ class NeuTTSClient:
         self.ref_codes = None
         self.connected = False
         self.audio_player = audio_player
+        self.cache = cache
+        self.rtf = RealTimeFactor()
+        self.sentence_split = sentence_split
+        # Native streaming is only implemented for GGUF (llama.cpp) backbones
+        self.streaming = streaming and "gguf" in backbone.lower()
+        self.reference_store = (
+            ReferenceEncodingStore(NEUTTS_REF_CACHE_DIR, f"{codec}|{codec_device}")
+            if NEUTTS_REF_CACHE_DIR else None
+        )
+
+    def load_model(self):
+        """Load the NeuTTS Air backbone and codec"""
+        # Import here to avoid requiring it if not used
+        from neuttsair.neutts import NeuTTSAir
+
+        logger.info(f"Loading NeuTTS Air model (backbone: {self.backbone})...")
+        logger.info("Note: On first run, NeuTTS will automatically download model files from HuggingFace")
+        logger.info("This is a one-time download (~1-2GB) and may take several minutes")
+
+        self.tts = NeuTTSAir(
+            backbone_repo=self.backbone,
+            backbone_device=self.backbone_device,
+            codec_repo=self.codec,
+            codec_device=self.codec_device
+        )
+
+    def encode_reference(self, ref_audio):
+        """Encode reference audio, reusing a stored encoding when available"""
+        if self.reference_store:
+            return self.reference_store.encode(ref_audio, self.tts.encode_reference)
+        logger.info(f"Encoding reference audio from {ref_audio}...")
+        return self.tts.encode_reference(ref_audio)
         
     async def connect(self):
         """Initialize NeuTTS model"""
         try:
-            # Import here to avoid requiring it if not used
-            from neuttsair.neutts import NeuTTSAir
-            import soundfile as sf
-
             if not self.ref_audio or not os.path.exists(self.ref_audio):
                 logger.error(f"Reference audio file not found: {self.ref_audio}")
                 self.connected = False
@@ -482,20 +2761,10 @@ class NeuTTSClient:
                 self.connected = False
                 return
 
-            logger.info(f"Loading NeuTTS Air model (backbone: {self.backbone})...")
-            logger.info("Note: On first run, NeuTTS will automatically download model files from HuggingFace")
-            logger.info("This is a one-time download (~1-2GB) and may take several minutes")
-
-            self.tts = NeuTTSAir(
-                backbone_repo=self.backbone,
-                backbone_device=self.backbone_device,
-                codec_repo=self.codec,
-                codec_device=self.codec_device
-            )
+            self.load_model()
 
             # Load and encode reference audio
-            logger.info(f"Encoding reference audio from {self.ref_audio}...")
-            self.ref_codes = self.tts.encode_reference(self.ref_audio)
+            self.ref_codes = self.encode_reference(self.ref_audio)
 
             # Load reference text
             with open(self.ref_text, 'r') as f:
@@ -511,7 +2780,7 @@ class NeuTTSClient:
             logger.error(f"Failed to initialize NeuTTS client: {e}")
             self.connected = False
             
-    async def send_transcription(self, text):
+    async def send_transcription(self, text, job=None):
         """Generate speech from transcription using NeuTTS"""
         if not self.connected:
             logger.warning("NeuTTS client not initialized, attempting to connect...")
@@ -519,21 +2788,105 @@ class NeuTTSClient:
             
         if self.connected and self.tts:
             try:
-                # Generate speech
-                wav = self.tts.infer(text, self.ref_codes, self.ref_text_content)
+                if self.streaming and self.audio_player:
+                    cache_key = self._cache_key(text)
+                    cached = self.cache.get(cache_key) if self.cache else None
+                    if cached is not None:
+                        logger.info(f"TTS cache hit for: {text}")
+                        await self.audio_player.play_async(
+                            cached[0], sample_rate=cached[1], deadline=job.deadline if job else None
+                        )
+                        return
+
+                    # Play audio frames as the backbone generates them
+                    loop = asyncio.get_running_loop()
+                    if await loop.run_in_executor(None, self._synthesize_streaming, text, cache_key, job):
+                        logger.info(f"Generated speech for: {text}")
+                        return
+
+                if self.sentence_split and self.audio_player:
+                    # Start speaking after the first sentence instead of the whole text
+                    await synthesize_segmented(
+                        text, self.cache, self._cache_key, self._synthesize, self.audio_player, job
+                    )
+                    logger.info(f"Generated speech for: {text}")
+                    return
+
+                # Generate speech off the event loop (or reuse a cached phrase)
+                wav, sample_rate = await synthesize_cached(
+                    self.cache, self._cache_key(text), self._synthesize, text, job
+                )
                 
                 logger.info(f"Generated speech for: {text}")
                 
                 # Play audio if audio player is available
                 if self.audio_player:
-                    self.audio_player.play(wav, sample_rate=24000)
+                    await self.audio_player.play_async(
+                        wav, sample_rate=sample_rate, deadline=job.deadline if job else None
+                    )
                     logger.info("Audio queued for playback")
                 else:
                     logger.warning("No audio player available, audio not played")
                 
+            except SynthesisCancelled:
+                raise
             except Exception as e:
                 logger.error(f"Error generating speech with NeuTTS: {e}")
                 
+    def _cache_key(self, text):
+        """TTS cache key for text in the current voice"""
+        return TTSCache.make_key(
+            "neutts", f"{self.backbone}|{self.codec}", self.ref_audio,
+            {"ref_text": self.ref_text_content}, text
+        )
+
+    def _synthesize(self, text):
+        """Run NeuTTS inference for text, returning (audio, sample_rate)"""
+        started = time.perf_counter()
+        wav = self.tts.infer(text, self.ref_codes, self.ref_text_content)
+        self.rtf.add(time.perf_counter() - started, len(wav) / 24000)
+        return wav, 24000
+
+    def _synthesize_streaming(self, text, cache_key, job=None):
+        """Queue audio from NeuTTS streaming inference as it is decoded
+
+        Returns False without playing anything if the backbone does not
+        support streaming, in which case streaming is disabled for the client.
+        A cancelled, expired or superseded ``job`` stops generation after the current chunk.
+        """
+        audio_chunks = []
+        deadline = job.deadline if job is not None else None
+        # Synthesis time only, excluding waits for room in the playback queue
+        synthesis_seconds = 0.0
+        started = time.perf_counter()
+        try:
+            for audio_chunk in self.tts.infer_stream(text, self.ref_codes, self.ref_text_content):
+                synthesis_seconds += time.perf_counter() - started
+                audio_chunk = np.asarray(audio_chunk, dtype=np.float32).reshape(-1)
+                audio_chunks.append(audio_chunk)
+                self.audio_player.play(
+                    audio_chunk, sample_rate=24000, final=False,
+                    deadline=deadline if len(audio_chunks) == 1 else None
+                )
+                if job is not None:
+                    job.check()
+                started = time.perf_counter()
+        except (AttributeError, NotImplementedError) as e:
+            if audio_chunks:
+                raise
+            logger.warning(f"NeuTTS backbone does not support streaming, using blocking inference: {e}")
+            self.streaming = False
+            return False
+        finally:
+            if audio_chunks:
+                # Empty final clip closes the utterance on the player
+                self.audio_player.play(np.zeros(0, dtype=np.float32), sample_rate=24000)
+                self.rtf.add(synthesis_seconds, sum(len(chunk) for chunk in audio_chunks) / 24000)
+
+        if self.cache and audio_chunks:
+            self.cache.put(cache_key, np.concatenate(audio_chunks), 24000)
+        return True
+
     async def close(self):
         """Close NeuTTS client"""
         self.tts = None
@@ -545,11 +2898,15 @@ class NeuTTSClient:
 class PiperClient:
     """Local Piper TTS client"""
 
-    def __init__(self, voice_path=PIPER_VOICE_PATH, audio_player=None):
+    def __init__(self, voice_path=PIPER_VOICE_PATH, audio_player=None, cache=None,
+                 streaming=PIPER_STREAMING):
         self.voice_path = voice_path
         self.tts = None
         self.connected = False
         self.audio_player = audio_player
+        self.cache = cache
+        self.rtf = RealTimeFactor()
+        self.streaming = streaming
         self.default_voice = "en_US-amy-medium"
 
     async def _download_voice_model(self, voice_name):
@@ -667,7 +3024,7 @@ class PiperClient:
             self.connected = False
             raise
 
-    async def send_transcription(self, text):
+    async def send_transcription(self, text, job=None):
         """Generate speech from transcription using Piper"""
         if not self.connected:
             logger.warning("Piper client not initialized, attempting to connect...")
@@ -675,42 +3032,127 @@ class PiperClient:
 
         if self.connected and self.tts:
             try:
-                # Use synthesize() which yields AudioChunk objects
-                audio_chunks = []
-                sample_rate = None
-
-                # Collect audio chunks from generator
-                for audio_chunk in self.tts.synthesize(text):
-                    # AudioChunk has audio_float_array property with numpy array
-                    audio_chunks.append(audio_chunk.audio_float_array)
-                    # Get sample rate from first chunk
-                    if sample_rate is None:
-                        sample_rate = audio_chunk.sample_rate
-
-                # Combine all chunks into single array
-                if audio_chunks:
-                    wav = np.concatenate(audio_chunks)
-
-                    # Use default sample rate if not set
-                    if sample_rate is None:
-                        sample_rate = 22050
+                started = time.monotonic()
+                loop = asyncio.get_running_loop()
+                cache_key = TTSCache.make_key("piper", self.voice_path, text=text)
+                cached = self.cache.get(cache_key) if self.cache else None
+
+                if cached is None and self.streaming and self.audio_player:
+                    # Hand each chunk to the player as soon as Piper yields it
+                    await loop.run_in_executor(
+                        None, self._synthesize_streaming, text, cache_key, started, job
+                    )
+                    return
 
+                if cached is not None:
+                    logger.info(f"TTS cache hit for: {text}")
+                    wav, sample_rate = cached
+                else:
+                    if job is not None:
+                        job.check()
+                    # Generate speech off the event loop
+                    wav, sample_rate = await loop.run_in_executor(None, self._synthesize, text)
+                    if self.cache and wav is not None:
+                        self.cache.put(cache_key, wav, sample_rate)
+
+                if wav is not None:
                     logger.info(f"Generated speech for: {text}")
 
                     # Play audio if audio player is available
                     if self.audio_player:
-                        self.audio_player.play(wav, sample_rate=sample_rate)
+                        await self.audio_player.play_async(
+                            wav, sample_rate=sample_rate, on_start=self._first_audio_callback(started),
+                            deadline=job.deadline if job else None
+                        )
                         logger.info("Audio queued for playback")
                     else:
                         logger.warning("No audio player available, audio not played")
                 else:
                     logger.warning("No audio generated by Piper")
 
+            except SynthesisCancelled:
+                raise
             except Exception as e:
                 logger.error(f"Error generating speech with Piper: {e}")
                 import traceback
                 logger.error(traceback.format_exc())
 
+    def _synthesize(self, text):
+        """Collect Piper audio chunks for text, returning (audio, sample_rate)"""
+        # Use synthesize() which yields AudioChunk objects
+        audio_chunks = []
+        sample_rate = None
+        started = time.perf_counter()
+
+        # Collect audio chunks from generator
+        for audio_chunk in self.tts.synthesize(text):
+            # AudioChunk has audio_float_array property with numpy array
+            audio_chunks.append(audio_chunk.audio_float_array)
+            # Get sample rate from first chunk
+            if sample_rate is None:
+                sample_rate = audio_chunk.sample_rate
+
+        if not audio_chunks:
+            return None, None
+
+        # Combine all chunks into single array, using default sample rate if not set
+        audio_data = np.concatenate(audio_chunks)
+        sample_rate = sample_rate or 22050
+        self.rtf.add(time.perf_counter() - started, len(audio_data) / sample_rate)
+        return audio_data, sample_rate
+
+    def _first_audio_callback(self, started):
+        """Playback callback logging the time from request to first audio sample
+
+        The same interval is aggregated as the ``tts_first_audio`` latency stage.
+        """
+        def log_first_audio():
+            logger.info(f"Time to first audio: {time.monotonic() - started:.3f}s")
+        return log_first_audio
+
+    def _synthesize_streaming(self, text, cache_key, started, job=None):
+        """Queue each Piper audio chunk for playback as soon as it is synthesized
+
+        A cancelled, expired or superseded ``job`` stops synthesis after the current chunk.
+        """
+        audio_chunks = []
+        sample_rate = None
+        deadline = job.deadline if job is not None else None
+        # Synthesis time only, excluding waits for room in the playback queue
+        synthesis_seconds = 0.0
+        chunk_started = time.perf_counter()
+
+        try:
+            for audio_chunk in self.tts.synthesize(text):
+                synthesis_seconds += time.perf_counter() - chunk_started
+                if job is not None:
+                    job.check()
+                if sample_rate is None:
+                    sample_rate = audio_chunk.sample_rate or 22050
+                audio_chunks.append(audio_chunk.audio_float_array)
+                self.audio_player.play(
+                    audio_chunk.audio_float_array,
+                    sample_rate=sample_rate,
+                    final=False,
+                    on_start=self._first_audio_callback(started) if len(audio_chunks) == 1 else None,
+                    deadline=deadline if len(audio_chunks) == 1 else None
+                )
+                chunk_started = time.perf_counter()
+        finally:
+            if audio_chunks:
+                # Empty final clip closes the utterance on the player
+                self.audio_player.play(np.zeros(0, dtype=np.float32), sample_rate=sample_rate)
+                self.rtf.add(synthesis_seconds, sum(len(chunk) for chunk in audio_chunks) / sample_rate)
+
+        if not audio_chunks:
+            logger.warning("No audio generated by Piper")
+            return
+
+        logger.info(f"Generated speech for: {text}")
+
+        if self.cache:
+            self.cache.put(cache_key, np.concatenate(audio_chunks), sample_rate)
+
     async def close(self):
         """Close Piper client"""
         self.tts = None
@@ -721,11 +3163,47 @@ class PiperClient:
 class StyleTTS2Client:
     """Local StyleTTS2 TTS client with voice cloning"""
 
-    def __init__(self, ref_audio=STYLETTS2_REF_AUDIO, audio_player=None):
+    def __init__(self, ref_audio=STYLETTS2_REF_AUDIO, audio_player=None, cache=None,
+                 sentence_split=TTS_SENTENCE_SPLIT):
         self.ref_audio = ref_audio
         self.tts = None
         self.connected = False
         self.audio_player = audio_player
+        self.cache = cache
+        self.rtf = RealTimeFactor()
+        self.sentence_split = sentence_split
+        self.style_store = (
+            ReferenceEncodingStore(STYLETTS2_STYLE_CACHE_DIR, "styletts2-style")
+            if STYLETTS2_STYLE_CACHE_DIR else None
+        )
+        # Style vector of the reference audio and the (path, digest) it was computed from
+        self.ref_style = None
+        self._ref_style_source = None
+
+    def set_reference_audio(self, ref_audio):
+        """Switch the cloned voice; the style vector is recomputed on next use"""
+        self.ref_audio = ref_audio
+        self.ref_style = None
+        self._ref_style_source = None
+
+    def _reference_style(self):
+        """Return the style vector for the current reference audio, or None for the default voice"""
+        if not self.ref_audio or not os.path.exists(self.ref_audio):
+            return None
+
+        source = (self.ref_audio, file_digest(self.ref_audio))
+        if self.ref_style is None or source != self._ref_style_source:
+            if self.style_store:
+                style = self.style_store.encode(self.ref_audio, self.tts.compute_style)
+            else:
+                logger.info(f"Computing reference style from {self.ref_audio}...")
+                style = self.tts.compute_style(self.ref_audio)
+            device = getattr(self.tts, "device", None)
+            if device is not None and hasattr(style, "to"):
+                style = style.to(device)
+            self.ref_style = style
+            self._ref_style_source = source
+        return self.ref_style
 
     async def connect(self):
         """Initialize StyleTTS2 model"""
@@ -744,6 +3222,9 @@ class StyleTTS2Client:
                 logger.warning(f"Reference audio file not found: {self.ref_audio}")
                 logger.warning("Will use default voice. Provide reference audio for voice cloning.")
 
+            # Compute the target style once instead of on every inference
+            self._reference_style()
+
             self.connected = True
             logger.info("StyleTTS2 model loaded successfully")
         except ImportError as e:
@@ -754,7 +3235,7 @@ class StyleTTS2Client:
             logger.error(f"Failed to initialize StyleTTS2 client: {e}")
             self.connected = False
 
-    async def send_transcription(self, text):
+    async def send_transcription(self, text, job=None):
         """Generate speech from transcription using StyleTTS2"""
         if not self.connected:
             logger.warning("StyleTTS2 client not initialized, attempting to connect...")
@@ -762,46 +3243,75 @@ class StyleTTS2Client:
 
         if self.connected and self.tts:
             try:
-                # Generate speech with optional voice cloning
-                if self.ref_audio and os.path.exists(self.ref_audio):
-                    # Use voice cloning
-                    wav = self.tts.inference(
-                        text,
-                        target_voice_path=self.ref_audio,
-                        output_wav_file=None,  # Return audio instead of saving
-                        output_sample_rate=24000
-                    )
-                else:
-                    # Use default voice
-                    wav = self.tts.inference(
-                        text,
-                        output_wav_file=None,
-                        output_sample_rate=24000
+                if self.sentence_split and self.audio_player:
+                    # Start speaking after the first sentence instead of the whole text
+                    await synthesize_segmented(
+                        text, self.cache, self._cache_key, self._synthesize, self.audio_player, job
                     )
+                    logger.info(f"Generated speech for: {text}")
+                    return
+
+                # Generate speech off the event loop (or reuse a cached phrase)
+                audio_data, sample_rate = await synthesize_cached(
+                    self.cache, self._cache_key(text), self._synthesize, text, job
+                )
 
                 logger.info(f"Generated speech for: {text}")
 
                 # Play audio if audio player is available
                 if self.audio_player:
-                    # StyleTTS2 returns tuple (audio, sample_rate)
-                    if isinstance(wav, tuple):
-                        audio_data, sample_rate = wav
-                    else:
-                        audio_data = wav
-                        sample_rate = 24000
-
-                    # Convert to numpy array if needed
-                    if not isinstance(audio_data, np.ndarray):
-                        audio_data = np.array(audio_data, dtype=np.float32)
-
-                    self.audio_player.play(audio_data, sample_rate=sample_rate)
+                    await self.audio_player.play_async(
+                        audio_data, sample_rate=sample_rate, deadline=job.deadline if job else None
+                    )
                     logger.info("Audio queued for playback")
                 else:
                     logger.warning("No audio player available, audio not played")
 
+            except SynthesisCancelled:
+                raise
             except Exception as e:
                 logger.error(f"Error generating speech with StyleTTS2: {e}")
 
+    def _cache_key(self, text):
+        """TTS cache key for text in the current voice"""
+        ref_audio = self.ref_audio if self.ref_audio and os.path.exists(self.ref_audio) else None
+        return TTSCache.make_key("styletts2", "default", ref_audio, {"output_sample_rate": 24000}, text)
+
+    def _synthesize(self, text):
+        """Run StyleTTS2 inference for text, returning (audio, sample_rate)"""
+        started = time.perf_counter()
+        # Generate speech with optional voice cloning
+        ref_style = self._reference_style()
+        if ref_style is not None:
+            # Use voice cloning with the precomputed style vector
+            wav = self.tts.inference(
+                text,
+                ref_s=ref_style,
+                output_wav_file=None,  # Return audio instead of saving
+                output_sample_rate=24000
+            )
+        else:
+            # Use default voice
+            wav = self.tts.inference(
+                text,
+                output_wav_file=None,
+                output_sample_rate=24000
+            )
+
+        # StyleTTS2 returns tuple (audio, sample_rate)
+        if isinstance(wav, tuple):
+            audio_data, sample_rate = wav
+        else:
+            audio_data = wav
+            sample_rate = 24000
+
+        # Convert to numpy array if needed
+        if not isinstance(audio_data, np.ndarray):
+            audio_data = np.array(audio_data, dtype=np.float32)
+
+        self.rtf.add(time.perf_counter() - started, len(audio_data) / sample_rate)
+        return audio_data, sample_rate
+
     async def close(self):
         """Close StyleTTS2 client"""
         self.tts = None
@@ -813,26 +3323,116 @@ def create_tts_client(audio_player=None):
     """Factory function to create appropriate TTS client based on configuration"""
     if TTS_SERVICE == "neutts":
         logger.info("Using NeuTTS Air local TTS service")
-        return NeuTTSClient(audio_player=audio_player)
+        return NeuTTSClient(audio_player=audio_player, cache=create_tts_cache())
     elif TTS_SERVICE == "piper":
         logger.info("Using Piper TTS service")
-        return PiperClient(audio_player=audio_player)
+        return PiperClient(audio_player=audio_player, cache=create_tts_cache())
     elif TTS_SERVICE == "styletts2":
         logger.info("Using StyleTTS2 TTS service")
-        return StyleTTS2Client(audio_player=audio_player)
+        return StyleTTS2Client(audio_player=audio_player, cache=create_tts_cache())
     else:
         logger.info("Using Speakerbot TTS service")
         return SpeakerbotClient()
 
 
+class MetricsServer:
+    """Minimal HTTP server exposing metrics in the Prometheus text format
+
+    ``collect`` returns (name, type, help, samples) tuples, where samples
+    are (labels dict, value) pairs, or (labels dict, value, name suffix)
+    for the ``_sum``/``_count`` series of a summary. It runs on the event loop and only reads
+    counters, so scrapes never wait on the audio threads.
+    """
+
+    CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+    def __init__(self, collect, host=METRICS_HOST, port=METRICS_PORT):
+        self.collect = collect
+        self.host = host
+        self.port = port
+        self._server = None
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        logger.info(f"Serving metrics on http://{self.host}:{self.port}/metrics")
+
+    async def close(self):
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    @staticmethod
+    def _escape(value):
+        return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+    @staticmethod
+    def _format_value(value):
+        """Sample value at full precision, so large counters are not rounded"""
+        if isinstance(value, (int, np.integer)):
+            return str(int(value))
+        value = float(value)
+        if math.isnan(value):
+            return "NaN"
+        if math.isinf(value):
+            return "+Inf" if value > 0 else "-Inf"
+        return repr(value)
+
+    @staticmethod
+    def render(families):
+        """Format metric families as Prometheus exposition text"""
+        lines = []
+        for name, metric_type, help_text, samples in families:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {metric_type}")
+            for labels, value, *suffix in samples:
+                if value is None:
+                    continue
+                label_text = ",".join(
+                    f'{key}="{MetricsServer._escape(val)}"' for key, val in labels.items()
+                )
+                series = name + "".join(suffix) + (f"{{{label_text}}}" if label_text else "")
+                lines.append(f"{series} {MetricsServer._format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+    async def _handle(self, reader, writer):
+        try:
+            request_line = await asyncio.wait_for(reader.readline(), timeout=5)
+            # Skip the request headers
+            while (await asyncio.wait_for(reader.readline(), timeout=5)).strip():
+                pass
+            parts = request_line.decode("latin-1").split()
+            path = parts[1].split("?")[0] if len(parts) > 1 else ""
+            if path in ("/", "/metrics"):
+                status, body = "200 OK", self.render(self.collect())
+            else:
+                status, body = "404 Not Found", "Not found\n"
+            payload = body.encode("utf-8")
+            writer.write(
+                f"HTTP/1.1 {status}\r\nContent-Type: {self.CONTENT_TYPE}\r\n"
+                f"Content-Length: {len(payload)}\r\nConnection: close\r\n\r\n".encode("latin-1") + payload
+            )
+            await writer.drain()
+        except Exception as e:
+            logger.debug(f"Metrics request failed: {e}")
+        finally:
+            writer.close()
+
+
 class SpeechToTextApp:
     """Main application class"""
     
-    def __init__(self):
+    def __init__(self, source=None):
+        # Optional AudioFileSource used instead of a microphone
+        self.source = source
         self.recorder = AudioRecorder()
         self.transcriber = WhisperTranscriber()
+        self.streaming_transcriber = StreamingTranscriber(self.transcriber)
+        self.text_queue = StageQueue("text", TEXT_QUEUE_SIZE, TEXT_QUEUE_OVERFLOW, merge=merge_synthesis_jobs)
+        self.cancelled_syntheses = 0
         self.audio_player = None
         self.client = None
+        self.metrics_server = MetricsServer(self.collect_metrics) if METRICS_PORT else None
         self.running = False
         
     async def run(self):
@@ -843,22 +3443,29 @@ class SpeechToTextApp:
             # Determine if we need output device selection
             need_output = TTS_SERVICE in ["neutts", "piper", "styletts2"]
 
-            # Show unified device selector
-            selector = AudioDeviceSelector(need_output=need_output)
-            input_device_index, output_device_index = selector.show()
-
-            # Check if user cancelled
-            if input_device_index is None:
-                logger.info("Device selection cancelled, exiting...")
-                return
+            if self.source is not None:
+                # Audio comes from a file or stdin, paced like a live capture;
+                # speech plays on the default output device
+                input_device_index, output_device_index = None, None
+                self.recorder = FileAudioRecorder(self.source)
+                logger.info(f"Using audio from {self.source.path}")
+            else:
+                # Show unified device selector
+                selector = AudioDeviceSelector(need_output=need_output)
+                input_device_index, output_device_index = selector.show()
+
+                # Check if user cancelled
+                if input_device_index is None:
+                    logger.info("Device selection cancelled, exiting...")
+                    return
 
-            # Initialize audio recorder with selected input device
-            self.recorder = AudioRecorder(device_index=input_device_index)
-            logger.info(f"Using microphone device: {input_device_index}")
+                # Initialize audio recorder with selected input device
+                self.recorder = AudioRecorder(device_index=input_device_index)
+                logger.info(f"Using microphone device: {input_device_index}")
 
             # Initialize audio player if output device was selected
             if need_output:
-                if output_device_index is not None:
+                if output_device_index is not None or self.source is not None:
                     self.audio_player = AudioPlayer(device_index=output_device_index)
                     self.audio_player.start()
                     logger.info(f"Using output device: {output_device_index}")
@@ -883,22 +3490,19 @@ class SpeechToTextApp:
             self.recorder.start()
             self.running = True
 
-            logger.info("Application is running. Press Ctrl+C to stop.")
+            if self.metrics_server:
+                await self.metrics_server.start()
 
-            while self.running:
-                # Get audio chunk
-                audio_chunk = self.recorder.get_audio_chunk(timeout=0.1)
-
-                if audio_chunk is not None:
-                    # Transcribe audio
-                    text = self.transcriber.transcribe(audio_chunk)
-
-                    if text:
-                        # Send to TTS service
-                        await self.client.send_transcription(text)
+            logger.info("Application is running. Press Ctrl+C to stop.")
 
-                # Small delay to prevent tight loop
-                await asyncio.sleep(0.01)
+            # Each stage runs concurrently, joined by bounded queues:
+            # capture (recorder thread) -> STT -> TTS -> playback (player thread)
+            stt_stage = asyncio.ensure_future(self._stt_stage())
+            await asyncio.gather(
+                stt_stage,
+                self._tts_stage(stt_stage),
+                self._report_pipeline_stats()
+            )
 
         except KeyboardInterrupt:
             logger.info("Received interrupt signal")
@@ -909,22 +3513,422 @@ class SpeechToTextApp:
         finally:
             await self.shutdown()
             
+    async def _stt_stage(self):
+        """Transcribe queued audio chunks and hand the text to the TTS stage
+
+        Returns once a file source has ended and all of its audio is transcribed.
+        """
+        while self.running:
+            audio_chunk = await self.recorder.audio_queue.get_async(timeout=0.1)
+            if audio_chunk is None:
+                if self.recorder.finished and self.recorder.audio_queue.empty():
+                    break
+                continue
+
+            if isinstance(audio_chunk, StreamingChunk):
+                trace = audio_chunk.trace
+                if trace is not None:
+                    trace.mark("stt_start")
+                # Forward committed words as soon as consecutive hypotheses agree
+                events = await self.streaming_transcriber.process_async(audio_chunk)
+                if trace is not None:
+                    trace.mark("stt_end")
+                final_events = [event for event in events if event.is_final]
+                for event in events:
+                    if event.is_final:
+                        # Only the words committed at the end of the utterance carry its trace
+                        job_trace = trace if event is final_events[-1] else None
+                        await self.text_queue.put_async(SynthesisJob.from_transcription(event.text, trace=job_trace))
+                    else:
+                        logger.info(f"Partial: {event.text}")
+                if trace is not None and not final_events:
+                    trace.finish()
+                continue
+
+            # Decode any further chunks that piled up as one batch
+            chunks = [audio_chunk] + self.recorder.audio_queue.drain(
+                STT_BATCH_SIZE - 1, lambda item: not isinstance(item, StreamingChunk)
+            )
+            for chunk in chunks:
+                if chunk.trace is not None:
+                    chunk.trace.mark("stt_start")
+            if len(chunks) > 1:
+                texts = await self.transcriber.transcribe_batch_async([chunk.audio for chunk in chunks])
+            else:
+                # Transcribe audio on the Whisper worker thread
+                texts = [await self.transcriber.transcribe_async(audio_chunk.audio)]
+
+            for chunk, text in zip(chunks, texts):
+                if chunk.trace is not None:
+                    chunk.trace.mark("stt_end")
+                if text:
+                    await self.text_queue.put_async(SynthesisJob.from_transcription(text, trace=chunk.trace))
+                elif chunk.trace is not None:
+                    chunk.trace.finish()
+
+    def _newer_job_due(self):
+        """True once the oldest waiting job has used half of its deadline budget
+
+        A reply that is already playing gives way to it, so the CPU goes to
+        the newest speech before that speech can no longer start in time.
+        """
+        waiting = self.text_queue.peek()
+        if waiting is None or waiting.deadline is None:
+            return False
+        return waiting.deadline - time.monotonic() < SYNTHESIS_DEADLINE / 2
+
+    async def _tts_stage(self, transcription_done):
+        """Send queued transcriptions to the TTS service
+
+        Once ``transcription_done`` completes and the text queue is empty,
+        waits for the queued speech to be played or sent and stops the app.
+        """
+        while self.running:
+            job = await self.text_queue.get_async(timeout=0.1)
+            if job is None:
+                if transcription_done.done() and self.text_queue.empty():
+                    await self._drain_output()
+                    logger.info("Input finished, stopping")
+                    self.running = False
+                continue
+            trace = job.trace
+            if trace is not None:
+                trace.backend = TTS_SERVICE
+                trace.mark("tts_start")
+            job.superseded = self._newer_job_due
+            if self.audio_player:
+                # Playback events of this job's clips are recorded on its trace
+                self.audio_player.trace = trace
+                self.audio_player.job = job
+            try:
+                # Skip text that waited in the queue past its deadline
+                job.check()
+                await self.client.send_transcription(job.text, job=job)
+            except SynthesisCancelled as e:
+                self.cancelled_syntheses += 1
+                logger.warning(f"Synthesis cancelled, {e}: {job.text}")
+                if trace is not None and not self.audio_player:
+                    trace.finish()
+            except Exception as e:
+                logger.error(f"Error in TTS stage: {e}")
+                if trace is not None and not self.audio_player:
+                    trace.finish()
+            finally:
+                if self.audio_player:
+                    self.audio_player.trace = None
+                    self.audio_player.job = None
+                    if trace is not None and "first_chunk" not in trace.events:
+                        # Nothing was queued, so no playback event will close the trace
+                        trace.finish()
+
+    def pipeline_stats(self):
+        """Depth and overflow counters of every pipeline queue"""
+        stats = {
+            "audio": dict(self.recorder.audio_queue.stats(), input_overflows=self.recorder.input_overflows),
+            "text": dict(self.text_queue.stats(), cancelled=self.cancelled_syntheses),
+        }
+        if isinstance(self.client, SpeakerbotClient):
+            stats["speakerbot"] = self.client.stats()
+        if self.audio_player:
+            stats["playback"] = dict(
+                self.audio_player.playback_queue.stats(), **self.audio_player.playback_stats()
+            )
+        return stats
+
+    def collect_metrics(self):
+        """Metric families for the metrics endpoint"""
+        queues = [self.recorder.audio_queue, self.text_queue]
+        if self.audio_player:
+            queues.append(self.audio_player.playback_queue)
+        if isinstance(self.client, SpeakerbotClient):
+            queues.append(self.client.outbound)
+        queue_stats = [({"queue": q.name}, q.stats()) for q in queues]
+
+        families = [
+            ("stts_queue_depth", "gauge", "Items waiting in a pipeline queue",
+             [(labels, s["depth"]) for labels, s in queue_stats]),
+            ("stts_queue_capacity", "gauge", "Maximum items in a pipeline queue",
+             [(labels, s["maxsize"]) for labels, s in queue_stats]),
+            ("stts_queue_high_watermark", "gauge", "Largest depth a pipeline queue has reached",
+             [(labels, s["high_watermark"]) for labels, s in queue_stats]),
+            ("stts_queue_dropped_total", "counter", "Items dropped by a queue's overflow policy",
+             [(labels, s["dropped"]) for labels, s in queue_stats]),
+            ("stts_queue_merged_total", "counter", "Items merged by a queue's overflow policy",
+             [(labels, s["merged"]) for labels, s in queue_stats]),
+            ("stts_input_overflows_total", "counter",
+             "Input device overflows, where captured audio was lost before it was read",
+             [({}, self.recorder.input_overflows)]),
+            ("stts_silence_skipped_chunks_total", "counter", "Chunks and utterances discarded by the silence gate",
+             [({}, self.recorder.skipped_chunks)]),
+            ("stts_stt_real_time_factor", "gauge", "Whisper processing time per second of audio",
+             [({"engine": STT_ENGINE}, self.transcriber.rtf.value)]),
+            ("stts_stt_audio_seconds_total", "counter", "Seconds of audio transcribed",
+             [({"engine": STT_ENGINE}, self.transcriber.rtf.audio_seconds)]),
+            ("stts_synthesis_cancelled_total", "counter", "Synthesis jobs cancelled for missing their deadline",
+             [({}, self.cancelled_syntheses)]),
+        ]
+
+        client_rtf = getattr(self.client, "rtf", None)
+        if client_rtf is not None:
+            families += [
+                ("stts_tts_real_time_factor", "gauge", "TTS synthesis time per second of generated audio",
+                 [({"backend": TTS_SERVICE}, client_rtf.value)]),
+                ("stts_tts_audio_seconds_total", "counter", "Seconds of audio synthesized",
+                 [({"backend": TTS_SERVICE}, client_rtf.audio_seconds)]),
+            ]
+        if isinstance(self.client, SpeakerbotClient):
+            stats = self.client.stats()
+            families += [
+                ("stts_speakerbot_connected", "gauge", "1 while connected to Speakerbot",
+                 [({}, int(stats["connected"]))]),
+                ("stts_speakerbot_reconnects_total", "counter", "Successful reconnects to Speakerbot",
+                 [({}, stats["reconnects"])]),
+                ("stts_speakerbot_sent_total", "counter", "Requests sent to Speakerbot",
+                 [({}, stats["sent"])]),
+                ("stts_speakerbot_in_flight", "gauge", "Requests awaiting a Speakerbot response",
+                 [({}, stats["in_flight"])]),
+            ]
+        if self.audio_player:
+            stats = self.audio_player.playback_stats()
+            families += [
+                ("stts_playback_underruns_total", "counter", "Output callbacks that ran dry mid-utterance",
+                 [({}, stats["underruns"])]),
+                ("stts_playback_dropped_clips_total", "counter", "Clips dropped for missing their deadline",
+                 [({}, stats["dropped_clips"])]),
+                ("stts_playback_buffered_seconds", "gauge", "Audio buffered ahead of the output device",
+                 [({}, stats["buffered_seconds"])]),
+            ]
+
+        latency_samples = []
+        for backend, stages in latency_tracker.stats().items():
+            for stage, s in stages.items():
+                labels = {"backend": backend, "stage": stage}
+                for key, quantile in (("p50", "0.5"), ("p95", "0.95"), ("p99", "0.99")):
+                    latency_samples.append((dict(labels, quantile=quantile), s[key]))
+                latency_samples.append((labels, s["sum"], "_sum"))
+                latency_samples.append((labels, s["total"], "_count"))
+        families.append(("stts_stage_latency_seconds", "summary",
+                         "Latency of each utterance stage (quantiles over a rolling window)", latency_samples))
+        return families
+
+    async def _drain_output(self):
+        """Wait until all queued speech has been played or sent to Speakerbot
+
+        Speakerbot requests are abandoned once they could no longer be sent
+        and acknowledged (the send queue TTL plus the ack timeout).
+        """
+        speakerbot = self.client if isinstance(self.client, SpeakerbotClient) else None
+        give_up = time.monotonic() + speakerbot.drain_timeout if speakerbot else None
+        while self.running:
+            if self.audio_player is not None and not self.audio_player.idle:
+                await asyncio.sleep(0.05)
+            elif speakerbot is not None and not speakerbot.idle:
+                if time.monotonic() >= give_up:
+                    stats = speakerbot.stats()
+                    logger.warning(
+                        f"Gave up on Speakerbot after {speakerbot.drain_timeout:.1f}s: "
+                        f"{stats['depth']} request(s) unsent, {stats['in_flight']} unacknowledged"
+                    )
+                    return
+                await asyncio.sleep(0.05)
+            else:
+                return
+
+    async def _report_pipeline_stats(self):
+        """Periodically log pipeline queue statistics"""
+        if PIPELINE_STATS_INTERVAL <= 0:
+            return
+        next_report = time.monotonic() + PIPELINE_STATS_INTERVAL
+        while self.running:
+            await asyncio.sleep(0.1)
+            if time.monotonic() < next_report:
+                continue
+            next_report += PIPELINE_STATS_INTERVAL
+            summary = ", ".join(
+                f"{name}: depth={s['depth']}/{s['maxsize']} dropped={s['dropped']} merged={s['merged']}"
+                + (f" stale={s['dropped_clips']} late={s['late_clips']}" if "dropped_clips" in s else "")
+                + (f" reconnects={s['reconnects']} in_flight={s['in_flight']}" if "reconnects" in s else "")
+                for name, s in self.pipeline_stats().items()
+            )
+            logger.info(f"Pipeline queues - {summary}")
+            for backend, stages in latency_tracker.stats().items():
+                latencies = ", ".join(
+                    f"{stage}: p50={s['p50'] * 1000:.0f} p95={s['p95'] * 1000:.0f} p99={s['p99'] * 1000:.0f}ms"
+                    for stage, s in stages.items()
+                )
+                logger.info(f"Latency ({backend}) - {latencies}")
+
     async def shutdown(self):
         """Shutdown the application"""
         logger.info("Shutting down...")
         self.running = False
         self.recorder.stop()
+        self.transcriber.close()
         if self.audio_player:
             self.audio_player.stop()
         if self.client:
             await self.client.close()
+        if self.metrics_server:
+            await self.metrics_server.close()
         logger.info("Application stopped")
 
 
+def encode_reference_voices(directory):
+    """Pre-encode every .wav reference voice in a directory for NeuTTS"""
+    if not NEUTTS_REF_CACHE_DIR:
+        logger.error("NEUTTS_REF_CACHE_DIR is empty, encoded references would not be stored")
+        return 1
+
+    paths = sorted(glob.glob(os.path.join(directory, "*.wav")))
+    if not paths:
+        logger.error(f"No .wav files found in {directory}")
+        return 1
+
+    client = NeuTTSClient()
+    client.load_model()
+    for path in paths:
+        client.encode_reference(path)
+    logger.info(f"Encoded {len(paths)} reference voice(s) into {NEUTTS_REF_CACHE_DIR}")
+    return 0
+
+
+# Transcriber of a batch transcription worker process
+_worker_transcriber = None
+
+
+def _init_transcribe_worker(model_name, engine, cpu_threads):
+    """Load the Whisper model once per batch transcription worker"""
+    global _worker_transcriber
+    if engine == "whisper" and cpu_threads > 0:
+        import torch
+        torch.set_num_threads(cpu_threads)
+    _worker_transcriber = WhisperTranscriber(model_name, engine, cpu_threads)
+
+
+def _transcribe_in_worker(audio_data):
+    return _worker_transcriber.transcribe(audio_data)
+
+
+def format_timestamp(seconds):
+    """Format seconds as HH:MM:SS.s"""
+    minutes, seconds = divmod(seconds, 60)
+    hours, minutes = divmod(int(minutes), 60)
+    return f"{hours:02d}:{minutes:02d}:{seconds:04.1f}"
+
+
+def transcribe_source(source, output_path=None, workers=1):
+    """Transcribe a whole audio source as fast as possible into an ordered transcript
+
+    The input is split at silence by the same segmenter as live capture and
+    the segments are transcribed in ``workers`` processes, each with its own
+    model. Lines are written in input order as ``[HH:MM:SS.s] text``.
+    """
+    recorder = FileAudioRecorder(source, realtime=False, segmentation_mode="vad", streaming=False)
+    workers = max(int(workers), 1)
+    executor = None
+    transcriber = None
+    if workers > 1:
+        # Share the cores between workers instead of each one using all of them
+        cpu_threads = STT_CPU_THREADS or max((os.cpu_count() or workers) // workers, 1)
+        executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_transcribe_worker,
+            initargs=(WHISPER_MODEL, STT_ENGINE, cpu_threads)
+        )
+    else:
+        transcriber = WhisperTranscriber()
+
+    output = open(output_path, 'w', encoding='utf-8') if output_path else sys.stdout
+    pending = deque()
+    segments = 0
+    started = time.monotonic()
+
+    def write_oldest():
+        start, result = pending.popleft()
+        text = result.result() if executor else result
+        if text:
+            output.write(f"[{format_timestamp(start)}] {text}\n")
+            output.flush()
+
+    try:
+        for chunk in recorder.chunks():
+            segments += 1
+            if executor:
+                pending.append((chunk.start, executor.submit(_transcribe_in_worker, chunk.audio)))
+                # Bound the audio held in memory while keeping every worker busy
+                while len(pending) > workers * 2:
+                    write_oldest()
+            else:
+                pending.append((chunk.start, transcriber.transcribe(chunk.audio)))
+                write_oldest()
+        while pending:
+            write_oldest()
+    finally:
+        if executor:
+            executor.shutdown(cancel_futures=True)
+        if output_path:
+            output.close()
+
+    elapsed = time.monotonic() - started
+    audio_seconds = recorder.samples_fed / recorder.sample_rate
+    logger.info(
+        f"Transcribed {segments} segment(s) from {audio_seconds:.1f}s of audio in {elapsed:.1f}s "
+        f"({audio_seconds / elapsed if elapsed else 0:.1f}x real time, {workers} worker(s))"
+    )
+    return 0
+
+
+def add_source_arguments(parser):
+    """Options describing a file or stdin audio source"""
+    parser.add_argument("--format", choices=AudioFileSource.FORMATS,
+                        help="Input format (default: from the extension, or sniffed for stdin)")
+    parser.add_argument("--raw-rate", type=int, default=SAMPLE_RATE, help="Sample rate of raw PCM input")
+    parser.add_argument("--raw-channels", type=int, default=1, help="Channels of raw PCM input")
+
+
+def source_from_args(path, args):
+    return AudioFileSource(path, args.format, raw_rate=args.raw_rate, raw_channels=args.raw_channels)
+
+
+def parse_args(argv=None):
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description="Speech-to-Text-to-Speech Application")
+    subparsers = parser.add_subparsers(dest="command")
+
+    run_parser = subparsers.add_parser("run", help="Run the application (default)")
+    run_parser.add_argument("--source", help="Read audio from a WAV/FLAC/raw PCM file or - for stdin "
+                                             "instead of a microphone, paced in real time")
+    add_source_arguments(run_parser)
+
+    encode_parser = subparsers.add_parser(
+        "encode-references", help="Pre-encode a directory of NeuTTS reference voices"
+    )
+    encode_parser.add_argument("directory", help="Directory containing reference .wav files")
+
+    transcribe_parser = subparsers.add_parser(
+        "transcribe", help="Transcribe a recording faster than real time into a transcript"
+    )
+    transcribe_parser.add_argument("input", help="WAV/FLAC/raw PCM file, or - for stdin")
+    transcribe_parser.add_argument("-o", "--output", help="Transcript file (default: stdout)")
+    transcribe_parser.add_argument("--workers", type=int, default=1,
+                                   help="Worker processes transcribing segments in parallel")
+    add_source_arguments(transcribe_parser)
+
+    return parser.parse_args(argv)
+
+
 def main():
     """Main entry point"""
+    args = parse_args()
     try:
-        app = SpeechToTextApp()
+        if args.command == "encode-references":
+            sys.exit(encode_reference_voices(args.directory))
+        if args.command == "transcribe":
+            sys.exit(transcribe_source(source_from_args(args.input, args), args.output, args.workers))
+
+        source = source_from_args(args.source, args) if getattr(args, "source", None) else None
+        app = SpeechToTextApp(source)
         asyncio.run(app.run())
     except Exception as e:
         logger.error(f"Application error: {e}")
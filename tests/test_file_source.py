@@ -0,0 +1,92 @@
+import asyncio
+import os
+import tempfile
+import time
+import unittest
+import wave
+from unittest import mock
+
+import numpy as np
+
+import main
+from benchmark import MockSpeakerbotServer
+from tests.test_speakerbot import free_port
+
+
+class FakeTranscriber:
+    """Stands in for Whisper so the test needs no model"""
+
+    def __init__(self, *args, **kwargs):
+        self.count = 0
+
+    async def transcribe_async(self, audio_data):
+        self.count += 1
+        return f"utterance {self.count}"
+
+    async def transcribe_batch_async(self, batch):
+        return [await self.transcribe_async(audio) for audio in batch]
+
+    def close(self):
+        pass
+
+
+def write_speech_wav(path, sample_rate=16000):
+    """Two short tone bursts separated by silence"""
+    t = np.arange(int(sample_rate * 0.6)) / sample_rate
+    tone = 0.3 * np.sin(2 * np.pi * 220 * t)
+    silence = np.zeros(int(sample_rate * 0.7))
+    audio = np.concatenate([silence, tone, silence, tone, silence])
+    with wave.open(path, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes((audio * 32767).astype(np.int16).tobytes())
+    return len(audio) / sample_rate
+
+
+class EndOfInputTest(unittest.TestCase):
+    """run --source exits after the input ends even if Speakerbot never answers"""
+
+    async def _run_app(self, path, client):
+        server = MockSpeakerbotServer(port=free_port(), ack_delay=3600, jitter=0)
+        await server.start()
+        client = client(server.url)
+        try:
+            with mock.patch.object(main, "TTS_SERVICE", "speakerbot"), \
+                    mock.patch.object(main, "WhisperTranscriber", FakeTranscriber), \
+                    mock.patch.object(main, "create_tts_client", lambda audio_player=None: client):
+                app = main.SpeechToTextApp(source=main.AudioFileSource(path))
+                with self.assertLogs(main.logger, "WARNING") as logs:
+                    await asyncio.wait_for(app.run(), timeout=20)
+            return client, logs.output
+        finally:
+            await server.stop()
+
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix=".wav")
+        os.close(handle)
+        self.duration = write_speech_wav(self.path)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_unanswered_requests_time_out(self):
+        started = time.monotonic()
+        client, logs = asyncio.run(self._run_app(
+            self.path, lambda url: main.SpeakerbotClient(url, ack_timeout=0.5)
+        ))
+        self.assertEqual(client.sent, 2)
+        self.assertEqual(client.ack_timeouts, 2)
+        self.assertLess(time.monotonic() - started, self.duration + 5)
+
+    def test_drain_gives_up_without_ack_timeout(self):
+        # With no ack timeout the requests never expire, so only the drain bound ends the run
+        client, logs = asyncio.run(self._run_app(
+            self.path, lambda url: main.SpeakerbotClient(url, ack_timeout=0, send_ttl=1.0)
+        ))
+        self.assertEqual(client.sent, 2)
+        self.assertTrue(any("Gave up on Speakerbot" in line and "2 unacknowledged" in line for line in logs))
+
+
+if __name__ == "__main__":
+    unittest.main()
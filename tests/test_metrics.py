@@ -0,0 +1,38 @@
+import unittest
+
+from main import LatencyTracker, MetricsServer, UtteranceTrace
+
+
+class RenderTest(unittest.TestCase):
+    def test_large_counters_keep_every_digit(self):
+        text = MetricsServer.render([
+            ("samples_total", "counter", "Samples", [({}, 1234567)]),
+            ("seconds_total", "counter", "Seconds", [({"engine": "whisper"}, 1234567.25)]),
+        ])
+        self.assertIn("samples_total 1234567\n", text)
+        self.assertIn('seconds_total{engine="whisper"} 1234567.25\n', text)
+
+    def test_stage_latency_is_a_summary(self):
+        tracker = LatencyTracker(window=2)
+        for gate in (0.1, 0.2, 0.3):
+            trace = UtteranceTrace(capture_end=10.0)
+            trace.mark("gate", 10.0 + gate)
+            tracker.record(trace)
+        stats = tracker.stats()["stt"]["gate"]
+        self.assertEqual(stats["count"], 2)
+        self.assertEqual(stats["total"], 3)
+        self.assertAlmostEqual(stats["sum"], 0.6)
+
+        labels = {"backend": "stt", "stage": "gate"}
+        text = MetricsServer.render([("latency_seconds", "summary", "Latency", [
+            (dict(labels, quantile="0.5"), stats["p50"]),
+            (labels, stats["sum"], "_sum"),
+            (labels, stats["total"], "_count"),
+        ])])
+        self.assertIn("# TYPE latency_seconds summary", text)
+        self.assertIn('latency_seconds_count{backend="stt",stage="gate"} 3\n', text)
+        self.assertIn('latency_seconds_sum{backend="stt",stage="gate"} ', text)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+import threading
+import time
+import unittest
+from unittest import mock
+
+import numpy as np
+
+import main
+
+
+class FakeOutputStream:
+    """Pulls audio through the player's callback at the device's pace"""
+
+    def __init__(self, rate, frames_per_buffer, stream_callback, **kwargs):
+        self._running = True
+        self._thread = threading.Thread(
+            target=self._run, args=(rate, frames_per_buffer, stream_callback), daemon=True
+        )
+        self._thread.start()
+
+    def _run(self, rate, frames, callback):
+        while self._running:
+            callback(None, frames, None, 0)
+            time.sleep(frames / rate)
+
+    def stop_stream(self):
+        self._running = False
+        self._thread.join()
+
+    def close(self):
+        pass
+
+
+class FakePyAudio:
+    def open(self, **kwargs):
+        return FakeOutputStream(**kwargs)
+
+    def terminate(self):
+        pass
+
+
+class UnderrunTest(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch.object(main.pyaudio, "PyAudio", FakePyAudio)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.player = main.AudioPlayer(output_rate=16000, queue_size=16, max_latency=0)
+        self.player.start()
+        self.addCleanup(self.player.stop)
+
+    def wait_until_idle(self, timeout=10):
+        deadline = time.monotonic() + timeout
+        while not self.player.idle and time.monotonic() < deadline:
+            time.sleep(0.02)
+        self.assertTrue(self.player.idle)
+
+    def test_silence_between_standalone_clips_is_not_an_underrun(self):
+        for _ in range(6):
+            self.player.play(np.full(1600, 0.1, dtype=np.float32), sample_rate=16000)
+            self.wait_until_idle()
+            time.sleep(0.05)
+        self.assertEqual(self.player.underruns, 0)
+
+    def test_gap_inside_an_utterance_is_an_underrun(self):
+        self.player.play(np.full(1600, 0.1, dtype=np.float32), sample_rate=16000, final=False)
+        # The continuation arrives after the first clip has played out
+        time.sleep(0.3)
+        self.player.play(np.full(1600, 0.1, dtype=np.float32), sample_rate=16000)
+        self.wait_until_idle()
+        self.assertGreater(self.player.underruns, 0)
+
+
+class StopTest(unittest.TestCase):
+    def test_stop_releases_a_blocked_producer(self):
+        with mock.patch.object(main.pyaudio, "PyAudio", FakePyAudio):
+            player = main.AudioPlayer(output_rate=16000, queue_size=1, overflow="block", max_latency=0)
+            player.start()
+            results = []
+            # Far more audio than the ring buffer and queue can hold, so play() blocks
+            producer = threading.Thread(target=lambda: results.extend(
+                player.play(np.zeros(16000, dtype=np.float32), sample_rate=16000, final=False)
+                for _ in range(20)
+            ))
+            producer.start()
+            time.sleep(0.3)
+            self.assertTrue(producer.is_alive())
+
+            player.stop()
+            producer.join(timeout=2)
+            self.assertFalse(producer.is_alive())
+            self.assertFalse(results[-1])
+            self.assertFalse(player.play(np.zeros(160, dtype=np.float32), sample_rate=16000))
+
+
+if __name__ == "__main__":
+    unittest.main()
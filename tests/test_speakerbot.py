@@ -0,0 +1,47 @@
+import asyncio
+import socket
+import unittest
+
+from benchmark import MockSpeakerbotServer
+from main import SpeakerbotClient
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class AckTimeoutTest(unittest.TestCase):
+    """Requests a peer never answers stop counting as in flight"""
+
+    async def _send_without_acks(self, max_in_flight):
+        server = MockSpeakerbotServer(port=free_port(), ack_delay=3600, jitter=0)
+        await server.start()
+        client = SpeakerbotClient(server.url, max_in_flight=max_in_flight, ack_timeout=0.3)
+        try:
+            await client.connect()
+            for i in range(3):
+                await client.send_transcription(f"hello {i}")
+            await asyncio.sleep(0.2)
+            self.assertEqual(client.sent, 3)
+            self.assertFalse(client.idle)
+
+            # No further sends: the sender's idle loop must expire the requests
+            await asyncio.sleep(0.6)
+            self.assertEqual(client.stats()["in_flight"], 0)
+            self.assertEqual(client.ack_timeouts, 3)
+            self.assertTrue(client.idle)
+        finally:
+            await client.close()
+            await server.stop()
+
+    def test_expires_with_unlimited_window(self):
+        asyncio.run(self._send_without_acks(max_in_flight=0))
+
+    def test_expires_with_bounded_window(self):
+        asyncio.run(self._send_without_acks(max_in_flight=4))
+
+
+if __name__ == "__main__":
+    unittest.main()